@@ -1,6 +1,24 @@
-import bisect
+import struct
+from bisect import bisect_left, bisect_right
+from operator import itemgetter
+
+# Tamanho de uma referência nas listas de chaves e filhos/valores dos nós
+REF_SIZE = struct.calcsize('P')
+
+# Ordem padrão dimensionada para que as chaves de um nó ocupem uma linha de
+# cache (64 bytes / 8 bytes por referência).
+DEFAULT_ORDER = 8
+
+
+def order_for_node_bytes(node_bytes):
+    # Ordem cujo array de chaves de um nó ocupa node_bytes. As listas guardam só
+    # referências, então o resultado não depende do tipo da chave.
+    return max(3, node_bytes // REF_SIZE)
+
 
 class BPlusTreeNode:
+    __slots__ = ('order', 'is_leaf', 'keys', 'children_or_values', 'next_leaf')
+
     def __init__(self, order, is_leaf=False):
         self.order = order
         self.is_leaf = is_leaf
@@ -13,20 +31,24 @@ class BPlusTreeNode:
 
 
 class BPlusTree:
-    def __init__(self, order=5):
+    def __init__(self, order=DEFAULT_ORDER):
         if order < 3:
             raise ValueError("A ordem de uma Árvore B+ deve ser no mínimo 3.")
         self.root = BPlusTreeNode(order, is_leaf=True)
         self.order = order
+        # Última folha que recebeu uma inserção e o intervalo [mínimo, máximo) de chaves que
+        # ela cobre; inserções seguintes no mesmo intervalo (ex: PKs crescentes) não descem
+        # a árvore. Qualquer divisão ou bulk_load invalida a dica.
+        self._hint = None
 
     def _find_leaf(self, key):
+        find_child = bisect_right
         node = self.root
         while not node.is_leaf:
-            i = bisect.bisect_right(node.keys, key)
-            node = node.children_or_values[i]
+            node = node.children_or_values[find_child(node.keys, key)]
         return node
 
-    def _split_leaf(self, leaf, parent):
+    def _split_leaf(self, leaf, path):
         mid_index = self.order // 2
         new_leaf = BPlusTreeNode(self.order, is_leaf=True)
         new_leaf.keys = leaf.keys[mid_index:]
@@ -35,60 +57,206 @@ class BPlusTree:
         leaf.children_or_values = leaf.children_or_values[:mid_index]
         new_leaf.next_leaf = leaf.next_leaf
         leaf.next_leaf = new_leaf
-        self._insert_in_parent(parent, new_leaf.keys[0], leaf, new_leaf)
+        self._insert_in_parent(path, new_leaf.keys[0], leaf, new_leaf)
+
+    def _split_internal(self, node, path):
+        # A chave do meio sobe para o pai e não é copiada para o novo nó.
+        mid_index = self.order // 2
+        promoted_key = node.keys[mid_index]
+        new_node = BPlusTreeNode(self.order, is_leaf=False)
+        new_node.keys = node.keys[mid_index + 1:]
+        new_node.children_or_values = node.children_or_values[mid_index + 1:]
+        node.keys = node.keys[:mid_index]
+        node.children_or_values = node.children_or_values[:mid_index + 1]
+        self._insert_in_parent(path, promoted_key, node, new_node)
 
-    def _insert_in_parent(self, parent, key, left_child, right_child):
-        if parent is None:
+    def _insert_in_parent(self, path, key, left_child, right_child):
+        if not path:
             new_root = BPlusTreeNode(self.order, is_leaf=False)
             new_root.keys = [key]
             new_root.children_or_values = [left_child, right_child]
             self.root = new_root
         else:
-            idx = bisect.bisect_right(parent.keys, key)
-            parent.keys.insert(idx, key)
-            parent.children_or_values.insert(idx + 1, right_child)
+            parent = path.pop()
+            idx = bisect_right(parent.keys, key)
+            parent.keys[idx:idx] = (key,)
+            parent.children_or_values[idx + 1:idx + 1] = (right_child,)
             if parent.is_full():
-                pass  # A divisão de nós internos pode ser adicionada aqui.
+                self._split_internal(parent, path)
 
     def insert(self, key, value):
-        parent = None
+        hint = self._hint
+        if hint is not None:
+            node, low, high = hint
+            # Só usa a dica se a folha não for se dividir (a divisão precisa do caminho)
+            if ((low is None or low <= key) and (high is None or key < high)
+                    and len(node.keys) < self.order - 1):
+                self._insert_in_leaf(node, key, value)
+                return
+
+        # Pilha com os nós internos visitados na descida, usada pelas divisões, e os
+        # separadores que limitam o intervalo de chaves da folha encontrada.
+        path = []
+        push = path.append
+        find_child = bisect_right
+        low = high = None
         node = self.root
         while not node.is_leaf:
-            parent = node
-            i = bisect.bisect_right(node.keys, key)
-            node = node.children_or_values[i]
+            push(node)
+            keys = node.keys
+            idx = find_child(keys, key)
+            if idx:
+                low = keys[idx - 1]
+            if idx != len(keys):
+                high = keys[idx]
+            node = node.children_or_values[idx]
 
-        try:
-            idx = node.keys.index(key)
+        keys = node.keys
+        idx = bisect_left(keys, key)
+        if idx < len(keys) and keys[idx] == key:
             node.children_or_values[idx] = value
             return
-        except ValueError:
-            pass
-
-        idx = bisect.bisect_left(node.keys, key)
-        node.keys.insert(idx, key)
-        node.children_or_values.insert(idx, value)
+        keys[idx:idx] = (key,)
+        node.children_or_values[idx:idx] = (value,)
 
         if node.is_full():
-            self._split_leaf(node, parent)
+            self._hint = None
+            self._split_leaf(node, path)
+        else:
+            self._hint = (node, low, high)
+
+    def _insert_in_leaf(self, node, key, value):
+        keys = node.keys
+        idx = bisect_left(keys, key)
+        if idx < len(keys) and keys[idx] == key:
+            node.children_or_values[idx] = value
+            return
+        keys[idx:idx] = (key,)
+        node.children_or_values[idx:idx] = (value,)
+
+    def delete(self, key):
+        # Remove a chave da folha com busca binária e remoção por fatia. As folhas não são
+        # fundidas nem redistribuídas: uma folha pode ficar vazia, o que não afeta as buscas
+        # (os separadores dos pais continuam válidos) e é desfeito no próximo bulk_load.
+        find_child = bisect_right
+        node = self.root
+        while not node.is_leaf:
+            node = node.children_or_values[find_child(node.keys, key)]
+        keys = node.keys
+        idx = bisect_left(keys, key)
+        if idx < len(keys) and keys[idx] == key:
+            del keys[idx:idx + 1]
+            del node.children_or_values[idx:idx + 1]
+            return True
+        return False
+
+    def bulk_load(self, pairs):
+        # Substitui o conteúdo da árvore construindo-a de baixo para cima a partir de
+        # pares (chave, valor): folhas cheias da esquerda para a direita e, em seguida,
+        # os níveis internos, sem as descidas e divisões de insert.
+        keys = []
+        values = []
+        for key, value in sorted(pairs, key=itemgetter(0)):
+            if keys and keys[-1] == key:
+                values[-1] = value
+            else:
+                keys.append(key)
+                values.append(value)
+
+        self._hint = None
+        if not keys:
+            self.root = BPlusTreeNode(self.order, is_leaf=True)
+            return
+
+        step = self.order - 1
+        level = []
+        prev_leaf = None
+        for start in range(0, len(keys), step):
+            leaf = BPlusTreeNode(self.order, is_leaf=True)
+            leaf.keys = keys[start:start + step]
+            leaf.children_or_values = values[start:start + step]
+            if prev_leaf is not None:
+                prev_leaf.next_leaf = leaf
+            prev_leaf = leaf
+            level.append(leaf)
+
+        # Menor chave de cada subárvore do nível atual, usada como separador no pai.
+        mins = keys[::step]
+        fanout = self.order
+        while len(level) > 1:
+            bounds = list(range(0, len(level), fanout)) + [len(level)]
+            # Evita que o último pai fique com um único filho.
+            if len(bounds) > 2 and bounds[-1] - bounds[-2] == 1:
+                bounds[-2] -= 1
+            parents = []
+            for start, end in zip(bounds, bounds[1:]):
+                parent = BPlusTreeNode(self.order, is_leaf=False)
+                parent.keys = mins[start + 1:end]
+                parent.children_or_values = level[start:end]
+                parents.append(parent)
+            mins = [mins[start] for start in bounds[:-1]]
+            level = parents
+        self.root = level[0]
 
     def search(self, key):
-        leaf = self._find_leaf(key)
-        try:
-            idx = leaf.keys.index(key)
-            return leaf.children_or_values[idx]
-        except ValueError:
-            return None
+        # Descida feita no próprio laço, sem o frame extra de _find_leaf.
+        find_child = bisect_right
+        node = self.root
+        while not node.is_leaf:
+            node = node.children_or_values[find_child(node.keys, key)]
+        keys = node.keys
+        idx = bisect_left(keys, key)
+        if idx < len(keys) and keys[idx] == key:
+            return node.children_or_values[idx]
+        return None
+
+    def range_scan(self, start=None, end=None, incl_start=True, incl_end=True):
+        # Percorre apenas as folhas do intervalo: desce até a folha de start e segue
+        # a lista encadeada até end. Limites None deixam o intervalo aberto.
+        if start is None:
+            node = self.root
+            while not node.is_leaf:
+                node = node.children_or_values[0]
+            idx = 0
+        else:
+            node = self._find_leaf(start)
+            idx = bisect_left(node.keys, start) if incl_start else bisect_right(node.keys, start)
+
+        while node:
+            values = node.children_or_values
+            if end is not None:
+                keys = node.keys
+                stop = bisect_right(keys, end) if incl_end else bisect_left(keys, end)
+                yield from values[idx:stop]
+                if stop < len(keys):
+                    return
+            else:
+                yield from values[idx:]
+            node = node.next_leaf
+            idx = 0
+
+    def iter_all(self):
+        # API pública: percorre todos os valores em ordem de chave sem montar uma lista,
+        # para quem consome a árvore aos poucos (ex: parar no primeiro valor que interessa).
+        # Quem precisa da lista inteira deve usar get_all, que é mais rápido.
+        node = self.root
+        while not node.is_leaf:
+            node = node.children_or_values[0]
+
+        while node:
+            yield from node.children_or_values
+            node = node.next_leaf
 
     def get_all(self):
-        results = []
+        # Um extend por folha copia a lista de valores em C, bem mais rápido que consumir
+        # o gerador de iter_all valor a valor; a lista cresce com realocação amortizada.
         node = self.root
-        if not node.keys and not node.is_leaf:
-            return []
         while not node.is_leaf:
             node = node.children_or_values[0]
 
+        results = []
+        extend = results.extend
         while node:
-            results.extend(node.children_or_values)
+            extend(node.children_or_values)
             node = node.next_leaf
         return results
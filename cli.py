@@ -1,12 +1,77 @@
-import shlex
+import re
+import sys
+from functools import lru_cache
 from table_schema import Column, TableSchema
 from database_manager import DatabaseManager
 
+
+# Literais reconhecidos pelo texto (sem diferenciar maiúsculas) e números, usados quando
+# o tipo da coluna não é conhecido
+_LITERALS = {'true': True, 'false': False}
+_NUM_RE = re.compile(r'-?(?:[0-9]+(?:\.[0-9]*)?|\.[0-9]+)')
+
+
+def _to_boolean(value_str):
+    value_str_lower = value_str.lower()
+    if value_str_lower == 'true':
+        return True
+    if value_str_lower == 'false':
+        return False
+    raise ValueError("use true ou false")
+
+
+def _to_string(value_str):
+    return value_str.strip("'\"")
+
+
+# Um token é uma sequência de trechos sem espaço, entre aspas simples ou entre aspas duplas
+# (ex: nome="TI Geral"); uma aspa que sobra sem par é capturada no grupo 1 para dar erro.
+_TOKEN_RE = re.compile(r"""(?:[^\s'"]+|'[^']*'|"[^"]*")+|(['"])""")
+_QUOTED_RE = re.compile(r"'([^']*)'|\"([^\"]*)\"")
+
+
+def _unquote(match):
+    single, double = match.groups()
+    return single if single is not None else double
+
+
+@lru_cache(maxsize=256)
+def _split_command(command_line):
+    # Tokens do comando e suas versões em maiúsculas, memorizados pelo texto da linha:
+    # comandos repetidos (ex: o mesmo SELECT) não são separados de novo. Como no shlex,
+    # as aspas delimitam trechos com espaços e são removidas do token.
+    parts = []
+    for match in _TOKEN_RE.finditer(command_line):
+        if match.group(1):
+            raise ValueError("No closing quotation")
+        token = match.group()
+        if "'" in token or '"' in token:
+            token = _QUOTED_RE.sub(_unquote, token)
+        parts.append(token)
+    parts = tuple(parts)
+    return parts, tuple(p.upper() for p in parts)
+
+
 class DatabaseCLI:
     VALID_TYPES = {'int', 'float', 'string', 'boolean'}
+    # Conversores de valor por tipo de coluna, usados quando o esquema da tabela é conhecido
+    CONVERTERS = {'int': int, 'float': float, 'boolean': _to_boolean, 'string': _to_string, 'date': _to_string}
 
     def __init__(self, db_path):
         self.db_manager = DatabaseManager(db_path)
+        # Texto do DESCRIBE por tabela: (esquema, texto renderizado)
+        self._describe_cache = {}
+        # Tabela de despacho dos comandos; os handlers retornam True para encerrar o laço
+        self._dispatch = {
+            "EXIT": self._cmd_exit,
+            "HELP": self._cmd_help,
+            "LIST TABLES": self._cmd_list_tables,
+            "DESCRIBE": self._cmd_describe,
+            "CREATE TABLE": self._cmd_create_table,
+            "INSERT": self._cmd_insert,
+            "SELECT": self._cmd_select,
+            "DELETE": self._cmd_delete,
+        }
 
     def _show_help(self):
         print("\n--- Comandos Disponíveis ---")
@@ -28,171 +93,206 @@ class DatabaseCLI:
         print("EXIT")
         print("  -> Salva o banco de dados e encerra o programa.\n")
 
-    def _parse_key_value(self, parts):
+    def _guess_value(self, value_str):
+        value_str_lower = value_str.lower()
+        if value_str_lower in _LITERALS:
+            return _LITERALS[value_str_lower]
+        if _NUM_RE.fullmatch(value_str):
+            return float(value_str) if '.' in value_str else int(value_str)
+        return value_str.strip("'\"")
+
+    def _parse_key_value(self, parts, schema=None):
+        # Com o esquema, cada valor é convertido direto pelo tipo declarado da coluna;
+        # sem ele (ou para colunas desconhecidas), o tipo é deduzido do texto.
+        columns = schema.columns if schema is not None else {}
+        converters = self.CONVERTERS
         record = {}
         for part in parts:
             if '=' not in part:
                 raise ValueError("Formato de inserção inválido. Use 'chave=valor'.")
             
             key, value_str = part.split('=', 1)
-            value_str_lower = value_str.lower()
-            
-            value = None
-            if value_str_lower == 'true':
-                value = True
-            elif value_str_lower == 'false':
-                value = False
-            elif value_str.isdigit():
-                value = int(value_str)
-            elif value_str.replace('.', '', 1).isdigit():
-                value = float(value_str)
+            column = columns.get(key)
+            converter = converters.get(column.data_type.lower()) if column is not None else None
+            if converter is None:
+                value = self._guess_value(value_str)
             else:
-                value = value_str.strip("'\"")
+                try:
+                    value = converter(value_str)
+                except ValueError:
+                    raise ValueError(f"Valor '{value_str}' inválido para a coluna '{key}' ({column.data_type}).")
 
-            record[key] = value
+            record[sys.intern(key)] = value
         return record
 
+    def _cmd_exit(self, parts, upper_parts):
+        self.db_manager.save_to_disk()
+        print("Até logo!")
+        return True
+
+    def _cmd_help(self, parts, upper_parts):
+        self._show_help()
+
+    def _cmd_list_tables(self, parts, upper_parts):
+        if not self.db_manager.tables:
+            print("Nenhuma tabela encontrada.")
+        for table_name in self.db_manager.tables:
+            print(f"- {table_name}")
+
+    def _cmd_describe(self, parts, upper_parts):
+        schema = self.db_manager.tables[parts[1]]
+        # O texto é montado uma vez por esquema; o cache é verificado pela identidade do objeto
+        cached = self._describe_cache.get(schema.name)
+        if cached is None or cached[0] is not schema:
+            cached = (schema, self._render_schema(schema))
+            self._describe_cache[schema.name] = cached
+        print(cached[1])
+
+    def _render_schema(self, schema):
+        lines = [f"Tabela: {schema.name}",
+                 f"  Chave Primária: {schema.pk_name}",
+                 "  Colunas:"]
+        lines.extend([f"    - {c.name} ({c.data_type}) {'NOT NULL' if not c.nullable else ''}"
+                      for c in schema.columns.values()])
+        if schema.foreign_keys:
+            lines.append("  Chaves Estrangeiras:")
+            lines.extend([f"    - {fk['fk_col']} -> {fk['ref_table']}({fk['ref_col']})"
+                          for fk in schema.foreign_keys])
+        return "\n".join(lines)
+
+    def _cmd_create_table(self, parts, upper_parts):
+        name = input("Nome da tabela: ")
+        pk = input("Nome da chave primária (ex: id): ")
+        
+        pk_type = ""
+        while pk_type not in self.VALID_TYPES:
+            pk_type = input(f"Tipo da chave primária '{pk}' (ex: int): ").lower()
+            if pk_type not in self.VALID_TYPES:
+                print(f"ERRO: Tipo inválido. Tipos permitidos: {', '.join(self.VALID_TYPES)}")
+        
+        cols = [Column(pk, pk_type, nullable=False)]
+        col_names_in_new_table = {pk} # Conjunto para busca rápida, atualizado a cada coluna
+        
+        while True:
+            col_str = input("Adicionar coluna (nome:tipo) ou 'fim' para terminar: ")
+            if col_str.lower() == 'fim': break
+            
+            if ':' not in col_str:
+                print("ERRO: Formato inválido. Use 'nome:tipo'. Tente novamente.")
+                continue
+
+            c_name, c_type = col_str.split(':', 1)
+            c_type = c_type.lower()
+            
+            if c_type not in self.VALID_TYPES:
+                print(f"ERRO: Tipo de dado '{c_type}' é inválido.")
+                print(f"Tipos permitidos são: {', '.join(self.VALID_TYPES)}. Tente novamente.")
+                continue
+
+            if c_name in col_names_in_new_table:
+                print(f"ERRO: A coluna '{c_name}' já foi definida nesta tabela. Tente novamente.")
+                continue
+
+            nullable_str = input(f"A coluna '{c_name}' pode ser nula? (s/N): ").lower()
+            cols.append(Column(c_name, c_type, nullable_str == 's'))
+            col_names_in_new_table.add(c_name)
+            print(f" -> Coluna '{c_name}' adicionada com sucesso.")
+        
+        # --- VALIDAÇÃO DE CHAVE ESTRANGEIRA (FK) ---
+        fks = []
+        
+        while True:
+            fk_str = input("Adicionar FK (coluna:tabela_ref:coluna_ref) ou 'fim' para terminar: ")
+            if fk_str.lower() == 'fim': break
+            
+            # 1. Validação do formato do comando
+            try:
+                fk_col, ref_table, ref_col = fk_str.split(':')
+            except ValueError:
+                print("ERRO: Formato inválido. Use o formato 'coluna:tabela_ref:coluna_ref'.")
+                continue
+
+            # 2. Validação da coluna local
+            if fk_col not in col_names_in_new_table:
+                print(f"ERRO: A coluna '{fk_col}' não foi definida nesta tabela. Defina a coluna primeiro.")
+                continue
+            
+            # 3. Validação da tabela de referência
+            if ref_table not in self.db_manager.tables:
+                print(f"ERRO: A tabela de referência '{ref_table}' não existe.")
+                continue
+                
+            # 4. Validação da coluna de referência (deve ser a PK da outra tabela)
+            referenced_schema = self.db_manager.tables[ref_table]
+            if ref_col != referenced_schema.pk_name:
+                print(f"ERRO: A coluna de referência '{ref_col}' não é a chave primária da tabela '{ref_table}'.")
+                print(f"       Chaves estrangeiras devem apontar para a chave primária (que é '{referenced_schema.pk_name}').")
+                continue
+
+            # Se todas as validações passaram, adiciona a FK
+            fks.append({'fk_col': fk_col, 'ref_table': ref_table, 'ref_col': ref_col})
+            print(f" -> FK em '{fk_col}' referenciando '{ref_table}({ref_col})' adicionada com sucesso.")
+
+        schema = TableSchema(name, cols, pk, fks)
+        self.db_manager.create_table(schema)
+        print(f"Tabela '{name}' criada com sucesso.")
+
+    def _cmd_insert(self, parts, upper_parts):
+        table_name = parts[2]
+        record = self._parse_key_value(parts[3:], self.db_manager.tables.get(table_name))
+        self.db_manager.insert(table_name, record)
+        print("Registro inserido com sucesso.")
+
+    def _cmd_select(self, parts, upper_parts):
+        table_name = parts[2]
+        where_clause = None
+        try:
+            where_idx = upper_parts.index("WHERE")
+        except ValueError:
+            where_idx = -1
+        if where_idx != -1:
+            where_clause = self._parse_key_value(parts[where_idx+1:], self.db_manager.tables.get(table_name))
+        
+        headers, rows = self.db_manager.select_rows(table_name, where_clause)
+        if not rows:
+            print("(0 linhas retornadas)")
+        else:
+            print(" | ".join(headers))
+            print("-" * (sum(len(str(h)) for h in headers) + 3 * len(headers)))
+            for row in rows:
+                print(" | ".join(['NULL' if value is None else str(value) for value in row]))
+
+    def _cmd_delete(self, parts, upper_parts):
+        table_name = parts[2]
+        schema = self.db_manager.tables[table_name]
+        where_clause = self._parse_key_value(parts[4:], schema)
+        pk_name = schema.get_pk_name()
+        if pk_name not in where_clause:
+            raise ValueError("DELETE só é permitido com a chave primária na cláusula WHERE.")
+        self.db_manager.delete(table_name, where_clause[pk_name])
+        print("Registro deletado com sucesso.")
+
     def run(self):
         print("Bem-vindo ao SGBD baseado em Árvores. Digite 'HELP' para ver os comandos.")
+        dispatch = self._dispatch
         while True:
             try:
                 command_line = input("db> ").strip()
                 if not command_line:
                     continue
 
-                parts = shlex.split(command_line)
-                command = parts[0].upper()
+                parts, upper_parts = _split_command(command_line)
+                command = upper_parts[0]
 
-                if command == "EXIT":
-                    self.db_manager.save_to_disk()
-                    print("Até logo!")
+                # Comandos de duas palavras (LIST TABLES, CREATE TABLE) são registrados com o par
+                handler = dispatch.get(command)
+                if handler is None and len(upper_parts) > 1:
+                    handler = dispatch.get(f"{command} {upper_parts[1]}")
+
+                if handler is None:
+                    print(f"ERRO: Comando '{command_line}' desconhecido ou incompleto.")
+                elif handler(parts, upper_parts):
                     break
-                elif command == "HELP":
-                    self._show_help()
-                elif command == "LIST" and len(parts) > 1 and parts[1].upper() == "TABLES":
-                    if not self.db_manager.tables:
-                        print("Nenhuma tabela encontrada.")
-                    for table_name in self.db_manager.tables:
-                        print(f"- {table_name}")
-                elif command == "DESCRIBE":
-                    schema = self.db_manager.tables[parts[1]]
-                    print(f"Tabela: {schema.name}")
-                    print(f"  Chave Primária: {schema.pk_name}")
-                    print("  Colunas:")
-                    for c in schema.columns.values():
-                        print(f"    - {c.name} ({c.data_type}) {'NOT NULL' if not c.nullable else ''}")
-                    if schema.foreign_keys:
-                        print("  Chaves Estrangeiras:")
-                        for fk in schema.foreign_keys:
-                            print(f"    - {fk['fk_col']} -> {fk['ref_table']}({fk['ref_col']})")
-                
-                elif command == "CREATE" and len(parts) > 1 and parts[1].upper() == "TABLE":
-                    name = input("Nome da tabela: ")
-                    pk = input("Nome da chave primária (ex: id): ")
-                    
-                    pk_type = ""
-                    while pk_type not in self.VALID_TYPES:
-                        pk_type = input(f"Tipo da chave primária '{pk}' (ex: int): ").lower()
-                        if pk_type not in self.VALID_TYPES:
-                            print(f"ERRO: Tipo inválido. Tipos permitidos: {', '.join(self.VALID_TYPES)}")
-                    
-                    cols = [Column(pk, pk_type, nullable=False)]
-                    
-                    while True:
-                        col_str = input("Adicionar coluna (nome:tipo) ou 'fim' para terminar: ")
-                        if col_str.lower() == 'fim': break
-                        
-                        if ':' not in col_str:
-                            print("ERRO: Formato inválido. Use 'nome:tipo'. Tente novamente.")
-                            continue
-
-                        c_name, c_type = col_str.split(':', 1)
-                        c_type = c_type.lower()
-                        
-                        if c_type not in self.VALID_TYPES:
-                            print(f"ERRO: Tipo de dado '{c_type}' é inválido.")
-                            print(f"Tipos permitidos são: {', '.join(self.VALID_TYPES)}. Tente novamente.")
-                            continue
-
-                        nullable_str = input(f"A coluna '{c_name}' pode ser nula? (s/N): ").lower()
-                        cols.append(Column(c_name, c_type, nullable_str == 's'))
-                        print(f" -> Coluna '{c_name}' adicionada com sucesso.")
-                    
-                    # --- VALIDAÇÃO DE CHAVE ESTRANGEIRA (FK) ---
-                    fks = []
-                    col_names_in_new_table = {c.name for c in cols} # Conjunto para busca rápida
-                    
-                    while True:
-                        fk_str = input("Adicionar FK (coluna:tabela_ref:coluna_ref) ou 'fim' para terminar: ")
-                        if fk_str.lower() == 'fim': break
-                        
-                        # 1. Validação do formato do comando
-                        try:
-                            fk_col, ref_table, ref_col = fk_str.split(':')
-                        except ValueError:
-                            print("ERRO: Formato inválido. Use o formato 'coluna:tabela_ref:coluna_ref'.")
-                            continue
-
-                        # 2. Validação da coluna local
-                        if fk_col not in col_names_in_new_table:
-                            print(f"ERRO: A coluna '{fk_col}' não foi definida nesta tabela. Defina a coluna primeiro.")
-                            continue
-                        
-                        # 3. Validação da tabela de referência
-                        if ref_table not in self.db_manager.tables:
-                            print(f"ERRO: A tabela de referência '{ref_table}' não existe.")
-                            continue
-                            
-                        # 4. Validação da coluna de referência (deve ser a PK da outra tabela)
-                        referenced_schema = self.db_manager.tables[ref_table]
-                        if ref_col != referenced_schema.pk_name:
-                            print(f"ERRO: A coluna de referência '{ref_col}' não é a chave primária da tabela '{ref_table}'.")
-                            print(f"       Chaves estrangeiras devem apontar para a chave primária (que é '{referenced_schema.pk_name}').")
-                            continue
-
-                        # Se todas as validações passaram, adiciona a FK
-                        fks.append({'fk_col': fk_col, 'ref_table': ref_table, 'ref_col': ref_col})
-                        print(f" -> FK em '{fk_col}' referenciando '{ref_table}({ref_col})' adicionada com sucesso.")
-
-                    schema = TableSchema(name, cols, pk, fks)
-                    self.db_manager.create_table(schema)
-                    print(f"Tabela '{name}' criada com sucesso.")
-
-                elif command == "INSERT":
-                    table_name = parts[2]
-                    record = self._parse_key_value(parts[3:])
-                    self.db_manager.insert(table_name, record)
-                    print("Registro inserido com sucesso.")
-
-                elif command == "SELECT":
-                    table_name = parts[2]
-                    where_clause = None
-                    if "WHERE" in [p.upper() for p in parts]:
-                        where_idx = [p.upper() for p in parts].index("WHERE")
-                        where_clause = self._parse_key_value(parts[where_idx+1:])
-                    
-                    results = self.db_manager.select(table_name, where_clause)
-                    if not results:
-                        print("(0 linhas retornadas)")
-                    else:
-                        headers = results[0].keys()
-                        print(" | ".join(headers))
-                        print("-" * (sum(len(str(h)) for h in headers) + 3 * len(headers)))
-                        for row in results:
-                            print(" | ".join(str(row.get(h, 'NULL')) for h in headers))
-
-                elif command == "DELETE":
-                    table_name = parts[2]
-                    where_clause = self._parse_key_value(parts[4:])
-                    pk_name = self.db_manager.tables[table_name].get_pk_name()
-                    if pk_name not in where_clause:
-                        raise ValueError("DELETE só é permitido com a chave primária na cláusula WHERE.")
-                    self.db_manager.delete(table_name, where_clause[pk_name])
-                    print("Registro deletado com sucesso.")
-
-                else:
-                    if command_line:
-                        print(f"ERRO: Comando '{command_line}' desconhecido ou incompleto.")
 
             except (ValueError, IndexError, KeyError, TypeError) as e:
                 print(f"ERRO: {e}")
@@ -1,94 +1,354 @@
-import tkinter as tk
-from tkinter import messagebox
 import os
 import json
-from datetime import datetime
+import mmap
+import pickle
+import re
+import struct
+from datetime import date, datetime
+from operator import itemgetter
+from bplustree import BPlusTree, order_for_node_bytes
+from table_schema import Column, TableSchema
 
-# --- MOCK BPlusTree, Column, and TableSchema for self-contained example ---
-# Essas classes são versões simplificadas para permitir que o DatabaseManager
-# funcione sem depender de implementações complexas de bplustree ou table_schema.
+# Ordem das árvores das tabelas: nós com ~1 KB de chaves. Nós largos deixam a árvore rasa,
+# e a busca dentro de cada nó é um bisect em C.
+_NODE_BYTES = 1024
+_TREE_ORDER = order_for_node_bytes(_NODE_BYTES)
 
-class BPlusTreeNode:
+# --- Predicados da cláusula WHERE ---
+# Um valor simples na cláusula where equivale a Equality(valor); Range e In permitem
+# consultas por intervalo e por lista de valores. Predicados sobre a PK são resolvidos
+# pelo índice/árvore (ver _extract_predicate); os demais filtram as linhas percorridas.
+
+class Equality:
+    """Predicado coluna == valor."""
+    def __init__(self, value):
+        self.value = value
+
+    def matches(self, value):
+        return value == self.value
+
+class Range:
+    """Predicado start <(=) coluna <(=) end. Limites None deixam o intervalo aberto (ex: BETWEEN, >, <)."""
+    def __init__(self, start=None, end=None, incl_start=True, incl_end=True):
+        self.start = start
+        self.end = end
+        self.incl_start = incl_start
+        self.incl_end = incl_end
+
+    def matches(self, value):
+        if value is None:
+            return False
+        start, end = self.start, self.end
+        if start is not None and (value < start if self.incl_start else value <= start):
+            return False
+        if end is not None and (value > end if self.incl_end else value >= end):
+            return False
+        return True
+
+class In:
+    """Predicado coluna IN (valores)."""
+    def __init__(self, values):
+        self.values = tuple(dict.fromkeys(values)) # Remove repetidos mantendo a ordem
+        self._value_set = set(self.values)
+
+    def matches(self, value):
+        return value in self._value_set
+
+def _as_predicate(value):
+    """Converte um valor da cláusula where em predicado (valores simples viram Equality)."""
+    return value if isinstance(value, (Equality, Range, In)) else Equality(value)
+
+def _extract_predicate(where_clause, pk_name):
+    """
+    Separa a cláusula where no predicado sobre a PK (ou None), que pode ser atendido pelo
+    índice de PK ou por uma varredura de intervalo na árvore, e nos predicados restantes.
+    """
+    pk_predicate = None
+    residual = {}
+    for col_name, value in where_clause.items():
+        if col_name == pk_name:
+            pk_predicate = _as_predicate(value)
+        else:
+            residual[col_name] = _as_predicate(value)
+    return pk_predicate, residual
+
+def _hashable(predicate):
+    """Indica se os valores de um predicado Equality/In podem ser buscados em um índice hash."""
+    try:
+        hash(predicate.value if type(predicate) is Equality else predicate.values)
+    except TypeError:
+        return False
+    return True
+
+class _QueryPlan:
+    """
+    Cláusula where compilada para uma tabela: o predicado da PK, os predicados que podem
+    ser atendidos por índices secundários e o filtro das demais colunas (itemgetter e
+    valores esperados das igualdades, mais os testes dos outros predicados).
+    Planos são guardados em _TableState.plans e reaproveitados por consultas repetidas,
+    junto com o último resultado (versão da tabela, linhas), válido enquanto a tabela não muda.
+    """
+    __slots__ = ('pk_predicate', 'index_predicates', 'getter', 'expected', 'others', 'has_filter',
+                 'result')
+
+    def __init__(self, state, where_clause):
+        col_index = state.col_index
+        for col_name in where_clause:
+            if col_name not in col_index:
+                raise ValueError(f"Coluna '{col_name}' não existe no esquema da tabela '{state.schema.name}'.")
+        pk_predicate, residual = _extract_predicate(where_clause, state.pk_name)
+        self.pk_predicate = pk_predicate
+
+        # Índices secundários só são usados quando não há predicado na PK. O predicado
+        # atendido pelo índice continua no filtro, o que permite escolher o índice mais
+        # seletivo a cada execução sem recompilar o plano.
+        secondary = state.secondary
+        self.index_predicates = () if pk_predicate is not None else tuple(
+            (col_index[k], p) for k, p in residual.items()
+            if col_index[k] in secondary and type(p) is not Range and _hashable(p))
+
+        # As igualdades (o caso comum) viram uma única comparação entre o itemgetter das
+        # colunas e a tupla de valores esperados, feita em C, sem laço Python por coluna.
+        eq_items = [(col_index[k], p.value) for k, p in residual.items() if type(p) is Equality]
+        if eq_items:
+            self.getter = itemgetter(*[i for i, _ in eq_items])
+            self.expected = eq_items[0][1] if len(eq_items) == 1 else tuple([v for _, v in eq_items])
+        else:
+            self.getter = self.expected = None
+        self.others = tuple((col_index[k], p.matches) for k, p in residual.items() if type(p) is not Equality)
+        self.has_filter = bool(residual)
+        self.result = (-1, None)
+
+# --- Validação de registros ---
+# Para cada tabela é gerada (uma vez, a partir do esquema) uma função que valida um registro
+# e o devolve como linha: os testes de nulidade e tipo de cada coluna ficam escritos em
+# sequência, sem laço sobre as colunas nem consulta ao tipo a cada inserção.
+
+def _type_error(col_name, expected, value):
+    return TypeError(f"Tipo de dado inválido para '{col_name}'. Esperado: {expected}, recebido: {type(value).__name__}.")
+
+_DATE_RE = re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2}')
+
+def _check_date(value, col_name):
+    if not isinstance(value, str):
+        raise _type_error(col_name, 'string no formato AAAA-MM-DD', value)
+    try:
+        # Caminho rápido para AAAA-MM-DD; outras grafias aceitas por strptime (ex: 2024-1-5) continuam válidas
+        if _DATE_RE.fullmatch(value):
+            date.fromisoformat(value)
+        else:
+            datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        raise ValueError(f"Formato de data inválido para '{col_name}'. Use o formato AAAA-MM-DD.")
+
+# Teste de tipo escrito no código gerado, por tipo de dado; o tipo 'date' chama _check_date
+# e tipos desconhecidos não são validados
+_TYPE_TESTS = {'int': 'isinstance({v}, int)', 'float': 'isinstance({v}, (int, float))',
+               'string': 'isinstance({v}, str)', 'boolean': 'isinstance({v}, bool)'}
+
+def _compile_validator(schema, pk_pos):
+    """
+    Gera a função validate(record) da tabela: rejeita colunas desconhecidas, valida
+    nulidade e tipo de cada coluna na ordem do esquema, rejeita PK nula e retorna a tupla
+    da linha. Os nomes e mensagens entram no código como constantes do namespace.
+    """
+    allowed = frozenset(schema.columns)
+
+    def unknown_column(record):
+        for col_name in record:
+            if col_name not in allowed:
+                raise ValueError(f"Coluna '{col_name}' não existe no esquema da tabela '{schema.name}'.")
+
+    ns = {'_allowed': allowed, '_unknown_column': unknown_column,
+          '_type_error': _type_error, '_check_date': _check_date}
+    lines = ['def validate(record):',
+             '    if not _allowed.issuperset(record):',
+             '        _unknown_column(record)']
+    for i, column in enumerate(schema.columns.values()):
+        v, n = f'v{i}', f'n{i}'
+        ns[n] = column.name
+        data_type = column.data_type.lower()
+        lines.append(f'    {v} = record.get({n})')
+        if not column.nullable:
+            ns[f'm{i}'] = f"Erro de integridade: Coluna '{column.name}' não pode ser nula."
+            lines += [f'    if {v} is None:', f'        raise ValueError(m{i})']
+        elif data_type in _TYPE_TESTS or data_type == 'date':
+            lines += [f'    if {v} is None:', '        pass']
+        if data_type in _TYPE_TESTS:
+            lines += [f'    elif not {_TYPE_TESTS[data_type].format(v=v)}:',
+                      f'        raise _type_error({n}, {data_type!r}, {v})']
+        elif data_type == 'date':
+            lines += ['    else:', f'        _check_date({v}, {n})']
+    ns['pk_message'] = f"Erro de integridade: Chave primária '{schema.get_pk_name()}' não pode ser nula."
+    lines += [f'    if v{pk_pos} is None:', '        raise ValueError(pk_message)',
+              '    return (' + ''.join(f'v{i}, ' for i in range(len(schema.columns))) + ')']
+    exec(compile('\n'.join(lines), f'<validate {schema.name}>', 'exec'), ns)
+    return ns['validate']
+
+# --- Log de alterações ---
+# Cada tabela é persistida como um snapshot ('tablename.pkl') mais um log só de acréscimo
+# ('tablename.log') com as inserções e exclusões feitas depois dele. Cada entrada do log é
+# um cabeçalho (tipo, tamanho) seguido do conteúdo serializado com pickle.
+_LOG_INSERT = 1 # conteúdo: a linha inserida
+_LOG_DELETE = 2 # conteúdo: a PK excluída
+_LOG_HEADER = struct.Struct('<BI')
+# O log é compactado em um novo snapshot quando passa deste múltiplo do tamanho do snapshot
+_LOG_COMPACT_RATIO = 2
+
+# Limite de planos guardados por tabela; ao atingi-lo, o cache é esvaziado
+_MAX_PLANS = 256
+
+class _TableState:
+    """
+    Informações pré-calculadas de uma tabela, consultadas a cada operação para evitar
+    buscas repetidas em self.tables/self.data e chamadas a get_pk_name().
+    Os registros são armazenados como tuplas alinhadas à ordem das colunas do esquema.
     """
-    Um nó mock de BPlusTree para representação interna simplificada.
-    Usado pela BPlusTree mock e adaptado para o método delete do DatabaseManager.
+    def __init__(self, schema, tree, pk_index):
+        self.schema = schema
+        self.tree = tree
+        self.pk_name = schema.get_pk_name()
+        self.col_names = tuple(schema.columns)
+        self.col_types = tuple([c.data_type.lower() for c in schema.columns.values()])
+        self.col_index = {name: i for i, name in enumerate(self.col_names)}
+        self.pk_pos = self.col_index[self.pk_name]
+        self.pk_index = pk_index # Índice hash PK -> linha
+        # validate(record) -> linha, gerada a partir do esquema (ver _compile_validator)
+        self.validate = _compile_validator(schema, self.pk_pos)
+        # Para cada FK: (posição da coluna, tabela referenciada, índice de PK dela, contagem de referências)
+        self.fk_refs = ()
+        # Versão dos dados, incrementada a cada alteração, e a última varredura completa
+        # (versão, linhas) para que leituras repetidas sem escritas não percorram a árvore
+        self.version = 0
+        self._scan_cache = (-1, ())
+        # Índices secundários: posição da coluna -> {valor: {PK: linha}}
+        self.secondary = {}
+        # Planos de consulta compilados, por cláusula where (ver _QueryPlan)
+        self.plans = {}
+        # Maior PK inserida (None até ser calculada em next_pk). Exclusões não a reduzem
+        # durante a sessão, mas ela não é gravada: ao recarregar, vem das linhas existentes
+        self.max_pk = None
+
+    def get_plan(self, where_clause):
+        """Retorna o _QueryPlan da cláusula where, compilando-o só na primeira vez."""
+        try:
+            key = tuple(where_clause.items())
+            plan = self.plans.get(key)
+        except TypeError:
+            return _QueryPlan(self, where_clause) # Valores não hasheáveis não são guardados
+        if plan is None:
+            plan = _QueryPlan(self, where_clause)
+            if len(self.plans) >= _MAX_PLANS:
+                self.plans.clear()
+            self.plans[key] = plan
+        return plan
+
+    def add_index(self, col_name):
+        """Cria (a partir das linhas atuais) um índice hash secundário sobre a coluna."""
+        pos = self.col_index[col_name]
+        if pos in self.secondary:
+            return
+        pk_pos = self.pk_pos
+        index = {}
+        for row in self.pk_index.values():
+            index.setdefault(row[pos], {})[row[pk_pos]] = row
+        self.secondary[pos] = index
+        self.plans.clear() # Os planos existentes não consideram o novo índice
+
+    def check_indexable(self, row):
+        """
+        Rejeita a linha se o valor de alguma coluna com índice secundário não for hasheável.
+        Chamada antes de qualquer alteração, para que index_row não falhe no meio da inserção.
+        """
+        for pos in self.secondary:
+            try:
+                hash(row[pos])
+            except TypeError:
+                raise TypeError(f"Valor inválido para a coluna indexada '{self.col_names[pos]}': "
+                                f"{type(row[pos]).__name__} não é hasheável.") from None
+
+    def index_row(self, row):
+        """Acrescenta a linha aos índices secundários."""
+        pk_value = row[self.pk_pos]
+        for pos, index in self.secondary.items():
+            index.setdefault(row[pos], {})[pk_value] = row
+
+    def unindex_row(self, row):
+        """Remove a linha dos índices secundários."""
+        pk_value = row[self.pk_pos]
+        for pos, index in self.secondary.items():
+            bucket = index[row[pos]]
+            del bucket[pk_value]
+            if not bucket:
+                del index[row[pos]]
+
+    def all_rows(self):
+        """Retorna uma tupla com todas as linhas da árvore, reaproveitada enquanto a tabela não muda."""
+        version, rows = self._scan_cache
+        if version != self.version:
+            rows = tuple(self.tree.get_all())
+            self._scan_cache = (self.version, rows)
+        return rows
+
+
+# Tipos de coluna cujos valores costumam se repetir (categorias, situações, datas)
+_STRING_TYPES = frozenset(('string', 'date'))
+
+def _dedupe_strings(column):
     """
-    def __init__(self, order):
-        self.order = order
-        self.keys = []
-        self.children_or_values = []
-        self.is_leaf = True
-        self.next_leaf = None # Não usado neste mock, mas parte de uma B+ Tree real
-
-class BPlusTree:
+    Faz valores iguais da coluna apontarem para o mesmo objeto str. O pickle grava cada
+    objeto uma única vez e referencia as repetições pelo memo, então o snapshot fica com uma
+    tabela de strings distintas, e as linhas carregadas dele compartilham esses objetos.
+    A deduplicação é feita só na gravação: linhas inseridas desde a última carga mantêm
+    seus próprios objetos até a tabela ser carregada de novo. Deduplicar em cada insert
+    exigiria uma tabela de strings que nunca encolhe (ou sys.intern, cujas strings não são
+    liberadas), guardando também valores únicos e já excluídos.
     """
-    Uma B-Plus Tree mock altamente simplificada usando um dicionário para armazenamento.
-    Esta classe destina-se apenas a permitir que o DatabaseManager seja executado para fins de demonstração,
-    e não para fornecer a funcionalidade completa de uma B-Plus Tree.
+    seen = {}
+    return tuple([seen.setdefault(value, value) for value in column])
+
+def _write_snapshot(f, state):
+    """
+    Grava o snapshot colunar da tabela em f: um pickle com os nomes das colunas seguido
+    de um pickle por coluna, na mesma ordem. As colunas são montadas (e deduplicadas) uma
+    de cada vez a partir de state.all_rows(), então além das linhas só uma coluna fica em
+    memória durante a gravação, em vez da tabela inteira transposta.
     """
-    def __init__(self, order=50):
-        # Usamos um dicionário interno para simular o armazenamento de chave-valor.
-        # Uma B-Plus Tree real gerenciaria seus nós e se balancearia.
-        self._data = {} 
-        self.order = order # Mantém a ordem para consistência com a inicialização do DatabaseManager
-
-    def insert(self, key, value):
-        """Insere um par chave-valor na árvore mock."""
-        self._data[key] = value
-
-    def search(self, key):
-        """Procura uma chave e retorna seu valor associado."""
-        return self._data.get(key)
-
-    def get_all(self):
-        """Retorna todos os valores (registros) atualmente armazenados na árvore mock."""
-        return list(self._data.values())
-
-    def _find_leaf(self, pk_value):
-        """
-        Simula a localização de um nó folha. Para fins de exclusão, retorna um nó folha mock
-        se a chave primária existir, permitindo que o método delete do DatabaseManager
-        interaja com ele (embora delete seja modificado para ignorar este mock).
-        """
-        if pk_value in self._data:
-            # Cria um nó folha mock que imita a estrutura esperada pelo método delete original
-            mock_leaf = BPlusTreeNode(self.order)
-            mock_leaf.is_leaf = True
-            mock_leaf.keys = [pk_value]
-            mock_leaf.children_or_values = [self._data[pk_value]]
-            return mock_leaf
-        return None # Chave não encontrada
-
-class Column:
-    """Representa uma coluna em um esquema de tabela de banco de dados."""
-    def __init__(self, name, data_type, primary_key=False, nullable=True):
-        self.name = name
-        self.data_type = data_type
-        self.primary_key = primary_key
-        self.nullable = nullable
-
-class TableSchema:
-    """Representa o esquema de uma tabela de banco de dados."""
-    def __init__(self, name, columns, pk_name=None, foreign_keys=None):
-        self.name = name
-        # Armazena as colunas como um dicionário para fácil consulta pelo nome
-        self.columns = {c.name: c for c in columns}
-        # Se pk_name não for fornecido, tenta inferi-lo a partir das colunas
-        self.pk_name = pk_name if pk_name else self._infer_pk_name(columns)
-        self.foreign_keys = foreign_keys if foreign_keys is not None else []
-
-    def _infer_pk_name(self, columns):
-        """Infer o nome da chave primária a partir da lista de colunas."""
-        for col in columns:
-            if col.primary_key:
-                return col.name
-        return None
-
-    def get_pk_name(self):
-        """Retorna o nome da coluna da chave primária."""
-        if not self.pk_name:
-            raise ValueError(f"Tabela '{self.name}' não tem chave primária definida.")
-        return self.pk_name
+    rows = state.all_rows()
+    pickle.dump(state.col_names, f, protocol=pickle.HIGHEST_PROTOCOL)
+    for pos, column_type in enumerate(state.col_types):
+        column = tuple(map(itemgetter(pos), rows))
+        if column_type in _STRING_TYPES:
+            column = _dedupe_strings(column)
+        pickle.dump(column, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+class _TableData(dict):
+    """
+    DatabaseManager.data: a BPlusTree de cada tabela. Tabelas ainda não lidas do disco só
+    entram no dicionário quando carregadas; acessá-las por data[nome] ou data.get(nome)
+    carrega a tabela na hora, e 'nome in data' as considera sem carregá-las.
+    Iteração, len, keys, values e items cobrem só as tabelas já carregadas; para listar
+    todas as tabelas use DatabaseManager.tables.
+    """
+    def __init__(self, manager):
+        super().__init__()
+        self._manager = manager
+
+    def __missing__(self, table_name):
+        if table_name in self._manager._pending_tables:
+            return self._manager._load_table(table_name).tree
+        raise KeyError(table_name)
+
+    def __contains__(self, table_name):
+        return super().__contains__(table_name) or table_name in self._manager._pending_tables
+
+    def get(self, table_name, default=None):
+        try:
+            return self[table_name]
+        except KeyError:
+            return default
+
 
 # --- Classe DatabaseManager (Fornecida pelo usuário) ---
 class DatabaseManager:
@@ -99,7 +359,21 @@ class DatabaseManager:
     def __init__(self, db_path='my_db'):
         self.db_path = db_path
         self.tables = {}  # Armazena objetos TableSchema
-        self.data = {}    # Armazena instâncias BPlusTree para cada tabela
+        self.data = _TableData(self)    # Armazena instâncias BPlusTree para cada tabela
+        self.pk_index = {}  # Índice hash PK -> linha para cada tabela
+        # Para cada tabela referenciada: lista de (tabela, coluna FK, contagem de referências por valor)
+        self.fk_refs = {}
+        self._table_cache = {}  # _TableState de cada tabela
+        # Tabelas cujos dados ainda não foram lidos do disco (carregadas no primeiro acesso)
+        self._pending_tables = set()
+        # Alterações de cada tabela desde o último salvamento: lista de entradas do log,
+        # ou None quando a tabela precisa de um snapshot completo (ex: tabela nova)
+        self._changes = {}
+        self._schema_dirty = False
+        # Colunas com índice secundário de cada tabela (salvas junto aos metadados)
+        self.indexes = {}
+        # Para cada tabela: tabelas cujas FKs a referenciam (definido pelos esquemas)
+        self._referenced_by = {}
         
         # Cria o diretório do banco de dados se não existir
         if not os.path.exists(db_path):
@@ -114,152 +388,409 @@ class DatabaseManager:
         """
         if schema.name in self.tables:
             raise ValueError(f"Tabela '{schema.name}' já existe.")
+        tree = BPlusTree(_TREE_ORDER) # Inicializa BPlusTree para nova tabela
+        # O estado da tabela é montado (validando PK e colunas de FK) antes que a tabela seja
+        # registrada nos demais mapas, para que um esquema inválido não a deixe pela metade
+        self._cache_table(schema, tree)
         self.tables[schema.name] = schema
-        self.data[schema.name] = BPlusTree(order=50) # Inicializa BPlusTree para nova tabela
-    
+        self._register_fks(schema)
+        self.data[schema.name] = tree
+        self._changes[schema.name] = None
+        self._schema_dirty = True
+
+    def _register_fks(self, schema):
+        """Registra a tabela em self._referenced_by de cada tabela que suas FKs referenciam."""
+        for _, ref_table in schema.fk_tuples:
+            self._referenced_by.setdefault(ref_table, set()).add(schema.name)
+
+    def _cache_table(self, schema, tree):
+        """
+        Monta o _TableState da tabela. Para cada FK, calcula a contagem de referências por
+        valor a partir das linhas já carregadas e a registra também em self.fk_refs.
+        Tudo que pode falhar é feito antes de alterar self.pk_index, self.fk_refs e
+        self._table_cache.
+        """
+        table_name = schema.name
+        pk_index = self.pk_index.get(table_name)
+        state = _TableState(schema, tree, {} if pk_index is None else pk_index)
+        counts = []
+        for fk_col, ref_table in schema.fk_tuples:
+            fk_pos = state.col_index[fk_col]
+            ref_counts = {}
+            for row in state.pk_index.values():
+                fk_value = row[fk_pos]
+                if fk_value is not None:
+                    ref_counts[fk_value] = ref_counts.get(fk_value, 0) + 1
+            counts.append((fk_col, fk_pos, ref_table, ref_counts))
+        for col_name in self.indexes.get(table_name, ()):
+            state.add_index(col_name)
+
+        self.pk_index[table_name] = state.pk_index
+        fk_refs = []
+        for fk_col, fk_pos, ref_table, ref_counts in counts:
+            self.fk_refs.setdefault(ref_table, []).append((table_name, fk_col, ref_counts))
+            # O índice de PK da tabela referenciada é criado aqui se ela ainda não existir;
+            # create_table/load_from_disk reaproveitam esse mesmo dicionário e o preenchem
+            fk_refs.append((fk_pos, ref_table, self.pk_index.setdefault(ref_table, {}), ref_counts))
+        state.fk_refs = tuple(fk_refs)
+        self._table_cache[table_name] = state
+
+    def create_index(self, table_name, col_name):
+        """
+        Cria um índice hash secundário sobre uma coluna que não é a PK. Consultas por
+        igualdade (ou IN) nessa coluna passam a buscar as linhas no índice em vez de
+        percorrer a tabela. O índice é mantido por insert/delete e recriado no carregamento.
+        """
+        state = self._get_state(table_name)
+        if col_name not in state.col_index:
+            raise ValueError(f"Coluna '{col_name}' não existe no esquema da tabela '{table_name}'.")
+        if col_name == state.pk_name:
+            raise ValueError(f"A coluna '{col_name}' é a chave primária e já é indexada.")
+        indexed = self.indexes.setdefault(table_name, [])
+        if col_name not in indexed:
+            indexed.append(col_name)
+            state.add_index(col_name)
+            self._schema_dirty = True
+
+    def _get_state(self, table_name):
+        state = self._table_cache.get(table_name)
+        if state is None:
+            if table_name not in self._pending_tables:
+                raise ValueError(f"Tabela '{table_name}' não encontrada.")
+            state = self._load_table(table_name)
+        return state
+
+    def _load_fk_targets(self, state):
+        """Carrega as tabelas referenciadas pelas FKs da tabela que ainda estejam pendentes."""
+        if self._pending_tables:
+            for _, ref_table in state.schema.fk_tuples:
+                if ref_table in self._pending_tables:
+                    self._load_table(ref_table)
+
     def insert(self, table_name, record: dict):
         """
         Insere um registro na tabela especificada.
         Realiza validação de esquema, verificação de tipo e verificações de integridade (PK/FK).
         """
-        if table_name not in self.tables:
-            raise ValueError(f"Tabela '{table_name}' não encontrada.")
-        
-        schema = self.tables[table_name]
+        state = self._get_state(table_name)
+        row = state.validate(record)
 
-        # 1. Valida se o registro contém apenas colunas definidas no esquema
-        for col_name in record:
-            if col_name not in schema.columns:
-                raise ValueError(f"Coluna '{col_name}' não existe no esquema da tabela '{table_name}'.")
-
-        # 2. Valida cada coluna em relação à sua definição de esquema
-        for col_name, col_schema in schema.columns.items():
-            value = record.get(col_name)
-            expected_type = col_schema.data_type.lower()
-
-            # A. Validação de nulidade
-            if value is None:
-                if not col_schema.nullable:
-                    raise ValueError(f"Erro de integridade: Coluna '{col_name}' não pode ser nula.")
-                continue # O valor é nulo e permitido, então passa para a próxima coluna
-
-            # B. Validação do tipo de dados
-            if expected_type == 'int' and not isinstance(value, int):
-                raise TypeError(f"Tipo de dado inválido para '{col_name}'. Esperado: int, recebido: {type(value).__name__}.")
-            elif expected_type == 'float' and not isinstance(value, (int, float)):
-                raise TypeError(f"Tipo de dado inválido para '{col_name}'. Esperado: float, recebido: {type(value).__name__}.")
-            elif expected_type == 'string' and not isinstance(value, str):
-                raise TypeError(f"Tipo de dado inválido para '{col_name}'. Esperado: string, recebido: {type(value).__name__}.")
-            elif expected_type == 'boolean' and not isinstance(value, bool):
-                raise TypeError(f"Tipo de dado inválido para '{col_name}'. Esperado: boolean, recebido: {type(value).__name__}.")
-            elif expected_type == 'date':
-                if not isinstance(value, str):
-                    raise TypeError(f"Tipo de dado inválido para '{col_name}'. Esperado: string no formato AAAA-MM-DD, recebido: {type(value).__name__}.")
-                try: 
-                    datetime.strptime(value, '%Y-%m-%d')
-                except ValueError:
-                    raise ValueError(f"Formato de data inválido para '{col_name}'. Use o formato AAAA-MM-DD.")
-        
         # Validação da Chave Primária (PK)
-        pk_name = schema.get_pk_name()
-        pk_value = record.get(pk_name)
-
-        if pk_value is None:
-            raise ValueError(f"Erro de integridade: Chave primária '{pk_name}' não pode ser nula.")
-        if self.data[table_name].search(pk_value) is not None:
+        pk_value = row[state.pk_pos]
+        pk_index = state.pk_index
+        if pk_value in pk_index:
             raise ValueError(f"Erro de integridade: Chave primária duplicada '{pk_value}'.")
         
         # Validação da Chave Estrangeira (FK)
-        for fk in schema.foreign_keys:
-            fk_value = record.get(fk['fk_col'])
+        self._load_fk_targets(state)
+        for fk_pos, ref_table, ref_index, _ in state.fk_refs:
+            fk_value = row[fk_pos]
             if fk_value is not None:
-                ref_table = fk['ref_table']
-                if ref_table not in self.data or self.data[ref_table].search(fk_value) is None:
+                if fk_value not in ref_index:
                     raise ValueError(f"Erro de integridade: FK '{fk_value}' não existe na tabela '{ref_table}'.")
+        if state.secondary:
+            state.check_indexable(row)
+
+        state.tree.insert(pk_value, row)
+        pk_index[pk_value] = row
+        if state.secondary:
+            state.index_row(row)
+        if state.max_pk is not None and pk_value > state.max_pk:
+            state.max_pk = pk_value
+        state.version += 1
+        for fk_pos, _, _, ref_counts in state.fk_refs:
+            fk_value = row[fk_pos]
+            if fk_value is not None:
+                ref_counts[fk_value] = ref_counts.get(fk_value, 0) + 1
+        changes = self._changes.setdefault(table_name, [])
+        if changes is not None:
+            changes.append((_LOG_INSERT, row))
+
+    def insert_many(self, table_name, records):
+        """
+        Insere vários registros de uma vez, com as mesmas validações de insert.
+        As verificações de integridade são feitas para o lote inteiro antes de qualquer
+        inserção: PKs repetidas no lote ou já existentes e FKs inexistentes são detectadas
+        com operações de conjunto sobre os valores distintos, e nenhum registro é inserido
+        se algum falhar. Uma FK pode referenciar uma PK inserida no mesmo lote (auto-referência).
+        Retorna o número de registros inseridos.
+        """
+        state = self._get_state(table_name)
+        validate = state.validate
+        rows = [validate(record) for record in records]
+        if not rows:
+            return 0
+
+        # Validação da Chave Primária (PK): repetidas no lote ou já existentes na tabela
+        pk_pos = state.pk_pos
+        pk_index = state.pk_index
+        batch_pks = {}
+        for row in rows:
+            pk_value = row[pk_pos]
+            if pk_value in batch_pks or pk_value in pk_index:
+                raise ValueError(f"Erro de integridade: Chave primária duplicada '{pk_value}'.")
+            batch_pks[pk_value] = row
 
-        self.data[table_name].insert(pk_value, record)
+        # Validação da Chave Estrangeira (FK): um teste por valor distinto
+        self._load_fk_targets(state)
+        for fk_pos, ref_table, ref_index, _ in state.fk_refs:
+            fk_values = {row[fk_pos] for row in rows}
+            fk_values.discard(None)
+            if ref_table == table_name:
+                fk_values.difference_update(batch_pks)
+            missing = fk_values.difference(ref_index)
+            if missing:
+                # Reporta o primeiro valor inexistente na ordem do lote
+                fk_value = next(row[fk_pos] for row in rows if row[fk_pos] in missing)
+                raise ValueError(f"Erro de integridade: FK '{fk_value}' não existe na tabela '{ref_table}'.")
+        if state.secondary:
+            for row in rows:
+                state.check_indexable(row)
+
+        # Lotes do tamanho da tabela ou maiores (inclusive em tabela vazia) remontam a árvore
+        # de uma só vez com bulk_load; lotes menores são inseridos um a um
+        tree = state.tree
+        if len(batch_pks) >= len(pk_index):
+            pk_index.update(batch_pks)
+            tree.bulk_load(pk_index.items())
+        else:
+            for pk_value, row in batch_pks.items():
+                tree.insert(pk_value, row)
+            pk_index.update(batch_pks)
+        if state.secondary:
+            for row in rows:
+                state.index_row(row)
+        if state.max_pk is not None:
+            state.max_pk = max(state.max_pk, max(batch_pks))
+        state.version += 1
+        for fk_pos, _, _, ref_counts in state.fk_refs:
+            for row in rows:
+                fk_value = row[fk_pos]
+                if fk_value is not None:
+                    ref_counts[fk_value] = ref_counts.get(fk_value, 0) + 1
+        changes = self._changes.setdefault(table_name, [])
+        if changes is not None:
+            changes.extend([(_LOG_INSERT, row) for row in rows])
+        return len(rows)
+
+    def next_pk(self, table_name):
+        """
+        Retorna o próximo valor de uma PK inteira: um a mais que a maior PK inserida.
+        A maior PK é calculada uma vez e depois mantida por insert/insert_many.
+        Tabelas cuja PK não é do tipo int são rejeitadas com ValueError.
+        """
+        state = self._get_state(table_name)
+        if state.col_types[state.pk_pos] != 'int':
+            raise ValueError(f"A chave primária '{state.pk_name}' da tabela '{table_name}' não é do tipo int.")
+        if state.max_pk is None:
+            state.max_pk = max(state.pk_index, default=0)
+        return state.max_pk + 1
 
     def select(self, table_name, where_clause=None):
         """
         Seleciona registros de uma tabela.
-        Pode filtrar por uma cláusula where (apenas correspondências exatas).
+        Pode filtrar por uma cláusula where: cada valor é comparado por igualdade ou pode ser
+        um predicado Range/In. Predicados sobre a PK usam o índice de PK ou uma varredura de
+        intervalo na árvore, e igualdades em colunas com índice secundário usam esse índice,
+        em vez de percorrer a tabela inteira.
+        Os registros são retornados como dicionários montados a partir das linhas armazenadas.
         """
-        if table_name not in self.data:
-            raise ValueError(f"Tabela '{table_name}' não encontrada.")
-        tree = self.data[table_name]
-        pk_name = self.tables[table_name].get_pk_name()
+        col_names, rows = self.select_rows(table_name, where_clause)
+        return [dict(zip(col_names, row)) for row in rows]
+
+    def select_rows(self, table_name, where_clause=None):
+        """
+        Como select, mas retorna (nomes das colunas, linhas), com cada linha sendo a tupla
+        armazenada na ordem das colunas, sem montar um dicionário por registro. Consultas
+        repetidas sem alterações na tabela reaproveitam a tupla de linhas do plano.
+        """
+        state = self._get_state(table_name)
 
         if not where_clause:
-            return tree.get_all()
-        
-        # Otimizado para pesquisa de chave primária se apenas PK estiver na cláusula where
-        if len(where_clause) == 1 and pk_name in where_clause:
-            result = tree.search(where_clause[pk_name])
-            return [result] if result else []
-        
-        # Filtragem geral para outras colunas ou múltiplas condições
-        all_records = tree.get_all()
-        filtered = [r for r in all_records if all(r.get(k) == v for k, v in where_clause.items())]
-        return filtered
+            return state.col_names, state.all_rows()
+
+        plan = state.get_plan(where_clause)
+        version, cached_rows = plan.result
+        if version == state.version:
+            return state.col_names, cached_rows
+
+        # Linhas candidatas: consultas pontuais no índice de PK, intervalo na árvore ou tudo
+        pk_predicate = plan.pk_predicate
+        pk_index = state.pk_index
+        if isinstance(pk_predicate, Equality):
+            row = pk_index.get(pk_predicate.value)
+            rows = (row,) if row is not None else ()
+        elif isinstance(pk_predicate, In):
+            rows = [pk_index[v] for v in pk_predicate.values if v in pk_index]
+        elif isinstance(pk_predicate, Range):
+            rows = state.tree.range_scan(pk_predicate.start, pk_predicate.end,
+                                         pk_predicate.incl_start, pk_predicate.incl_end)
+        else:
+            rows = None
+            # Sem predicado na PK: usa o índice secundário mais seletivo, se houver
+            secondary = state.secondary
+            for pos, predicate in plan.index_predicates:
+                index = secondary[pos]
+                if type(predicate) is Equality:
+                    candidates = index.get(predicate.value, {}).values()
+                else:
+                    candidates = [row for v in predicate.values for row in index.get(v, {}).values()]
+                if rows is None or len(candidates) < len(rows):
+                    rows = candidates
+            if rows is None:
+                rows = state.all_rows()
+
+        # Demais condições: compara posições das tuplas e só monta os registros que casam
+        if plan.has_filter:
+            getter, expected, others = plan.getter, plan.expected, plan.others
+            if getter is None:
+                rows = [row for row in rows if all(m(row[i]) for i, m in others)]
+            elif others:
+                rows = [row for row in rows if getter(row) == expected and all(m(row[i]) for i, m in others)]
+            else:
+                rows = [row for row in rows if getter(row) == expected]
+        rows = tuple(rows)
+        plan.result = (state.version, rows)
+        return state.col_names, rows
 
     def delete(self, table_name, pk_value):
         """
         Exclui um registro da tabela especificada por sua chave primária.
         Realiza verificações de integridade de chave estrangeira antes da exclusão.
         """
-        if table_name not in self.tables:
-            raise ValueError(f"Tabela '{table_name}' não encontrada.")
-        
+        state = self._get_state(table_name)
+
+        # As contagens de referências só existem para tabelas já carregadas
+        if self._pending_tables:
+            for other_table in self._referenced_by.get(table_name, ()):
+                if other_table in self._pending_tables:
+                    self._load_table(other_table)
+
         # Verifica se há chaves estrangeiras dependentes em outras tabelas
-        for other_table, other_schema in self.tables.items():
-            if other_table == table_name: 
+        for other_table, _, ref_counts in self.fk_refs.get(table_name, ()):
+            if other_table == table_name:
                 continue # Pula a tabela da qual estamos excluindo
-            for fk in other_schema.foreign_keys:
-                if fk['ref_table'] == table_name:
-                    # Se qualquer outra tabela fizer referência a este registro, impede a exclusão
-                    if self.select(other_table, where_clause={fk['fk_col']: pk_value}):
-                        raise ValueError(f"Erro: Não é possível deletar, registro é referenciado em '{other_table}'.")
+            # Se qualquer outra tabela fizer referência a este registro, impede a exclusão
+            if pk_value in ref_counts:
+                raise ValueError(f"Erro: Não é possível deletar, registro é referenciado em '{other_table}'.")
         
-        # Exclui o registro diretamente do dicionário interno da BPlusTree mock
-        # O código original interagia com nós folha, mas nosso mock simplifica isso.
-        if pk_value in self.data[table_name]._data:
-            del self.data[table_name]._data[pk_value]
-        else:
+        row = state.pk_index.pop(pk_value, None)
+        if row is None:
             raise ValueError(f"Registro com PK '{pk_value}' não encontrado para deleção.")
 
+        state.tree.delete(pk_value)
+        if state.secondary:
+            state.unindex_row(row)
+        state.version += 1
+
+        # Libera as referências que este registro fazia a outras tabelas
+        for fk_pos, _, _, ref_counts in state.fk_refs:
+            fk_value = row[fk_pos]
+            if fk_value is not None:
+                if ref_counts[fk_value] == 1:
+                    del ref_counts[fk_value]
+                else:
+                    ref_counts[fk_value] -= 1
+        changes = self._changes.setdefault(table_name, [])
+        if changes is not None:
+            changes.append((_LOG_DELETE, pk_value))
+
     def save_to_disk(self):
         """
-        Salva o estado atual do banco de dados (esquemas e dados) em arquivos JSON no disco.
+        Salva o estado atual do banco de dados (esquemas e dados) em disco.
         Os metadados (esquemas de tabela) são salvos em 'metadata.json'.
-        Os dados de cada tabela são salvos em um arquivo JSON separado (ex: 'tablename.json').
+        Os dados de cada tabela são salvos em um arquivo binário (pickle) separado (ex: 'tablename.pkl').
+        Apenas os metadados e as tabelas alterados desde o último salvamento são gravados; as
+        alterações de uma tabela são acrescentadas ao seu log ('tablename.log'), que é
+        compactado em um novo snapshot quando fica grande demais.
         """
-        metadata_path = os.path.join(self.db_path, 'metadata.json')
-        
-        # Prepara metadados para serialização JSON: converte objetos Column para dicionários
-        metadata = {}
-        for name, schema in self.tables.items():
-            # Cria uma cópia do dicionário do esquema para evitar modificar o objeto original
-            schema_dict = schema.__dict__.copy() 
-            # Converte o dicionário de objetos Column para uma lista de suas representações de dicionário
-            schema_dict['columns'] = [c.__dict__ for c in schema.columns.values()]
-            metadata[name] = schema_dict
-
-        # Salva esquemas de tabela (metadados)
-        with open(metadata_path, 'w') as f:
-            json.dump(metadata, f, indent=4)
-        
-        # Salva dados para cada tabela
-        for table_name, tree in self.data.items():
-            data_path = os.path.join(self.db_path, f"{table_name}.json")
-            with open(data_path, 'w') as f:
-                # O método get_all() da BPlusTree mock retorna uma lista de registros, que é serializável em JSON
-                json.dump(tree.get_all(), f, indent=4)
+        # Todos os arquivos são escritos antes de qualquer fsync: o kernel já começa a gravar
+        # cada um enquanto os demais são escritos, e os fsyncs, feitos juntos no final, só
+        # esperam o que ainda falta. Os renomes dos temporários vêm depois dos fsyncs.
+        pending = []
+        obsolete_logs = []
+        metadata_path = None
+        try:
+            if self._schema_dirty:
+                metadata_path = os.path.join(self.db_path, 'metadata.json')
+
+                # Prepara metadados para serialização JSON: converte objetos Column para dicionários
+                metadata = {name: schema.to_dict() for name, schema in self.tables.items()}
+                for name, indexed in self.indexes.items():
+                    metadata[name]['indexes'] = indexed
+
+                # Salva esquemas de tabela (metadados)
+                payload = json.dumps(metadata, indent=4).encode()
+                pending.append(self._write_file(metadata_path, lambda f: f.write(payload)))
+
+            # Tabelas não alteradas (inclusive as ainda não carregadas) mantêm os arquivos atuais.
+            for table_name, changes in self._changes.items():
+                data_path = os.path.join(self.db_path, f"{table_name}.pkl")
+                log_path = os.path.join(self.db_path, f"{table_name}.log")
+                if changes is not None and os.path.exists(data_path):
+                    if not changes:
+                        continue
+                    chunks = []
+                    for tag, payload in changes:
+                        buf = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+                        chunks.append(_LOG_HEADER.pack(tag, len(buf)))
+                        chunks.append(buf)
+                    f = open(log_path, 'ab')
+                    pending.append((f, None, log_path))
+                    f.write(b''.join(chunks))
+                    f.flush()
+                    if os.path.getsize(log_path) <= _LOG_COMPACT_RATIO * os.path.getsize(data_path):
+                        continue
+
+                # Snapshot completo em formato colunar: uma tupla de valores por coluna, sem a
+                # sobrecarga de uma tupla por linha no arquivo, e a coluna da PK já serve de lista
+                # de chaves no carregamento. O log é descartado só depois que o novo snapshot
+                # está gravado; reaplicá-lo seria inofensivo. Cada coluna é gravada assim que
+                # montada (ver _write_snapshot).
+                state = self._table_cache[table_name]
+                pending.append(self._write_file(data_path, lambda f, state=state: _write_snapshot(f, state)))
+                obsolete_logs.append(log_path)
+
+            for f, _, _ in pending:
+                os.fsync(f.fileno())
+        finally:
+            for f, _, _ in pending:
+                f.close()
+
+        for _, tmp_path, path in pending:
+            if tmp_path is not None:
+                os.replace(tmp_path, path)
+                if path == metadata_path:
+                    self._schema_dirty = False # Só depois que os metadados novos estão no lugar
+        for log_path in obsolete_logs:
+            if os.path.exists(log_path):
+                os.remove(log_path)
+        self._changes.clear()
         
         print("INFO: Banco de dados salvo em disco.")
 
+    @staticmethod
+    def _write_file(path, write):
+        """
+        Chama write(f) com um arquivo binário temporário, que depois de sincronizado é
+        renomeado sobre o destino, para que uma falha no meio do salvamento não deixe um
+        arquivo truncado. Retorna (arquivo ainda aberto, caminho temporário, destino); o
+        fsync, o fechamento e o renome ficam com save_to_disk.
+        """
+        tmp_path = path + '.tmp'
+        f = open(tmp_path, 'wb')
+        try:
+            write(f)
+            f.flush()
+        except BaseException:
+            f.close()
+            raise
+        return f, tmp_path, path
+
     def load_from_disk(self):
         """
-        Carrega o estado do banco de dados (esquemas e dados) de arquivos JSON no disco.
+        Carrega os esquemas do banco de dados a partir de 'metadata.json'.
+        Os dados de cada tabela só são lidos no primeiro acesso à tabela (ver _load_table).
         Se 'metadata.json' não for encontrado, um novo banco de dados vazio é inicializado.
         """
         metadata_path = os.path.join(self.db_path, 'metadata.json')
@@ -281,21 +812,108 @@ class DatabaseManager:
             # Reconstrói o objeto TableSchema, incluindo chaves estrangeiras se presentes
             schema = TableSchema(name, columns, schema_data['pk_name'], schema_data.get('foreign_keys'))
             self.tables[schema.name] = schema
-            self.data[schema.name] = BPlusTree(order=50) # Inicializa uma nova BPlusTree para esta tabela
-
-            # Carrega dados para a tabela atual
-            data_path = os.path.join(self.db_path, f"{name}.json")
-            if os.path.exists(data_path):
-                with open(data_path, 'r') as f:
-                    records = json.load(f)
-                for record in records:
-                    pk_value = record[schema.get_pk_name()]
-                    self.data[name].insert(pk_value, record) # Insere registros na BPlusTree
-        
+            self._register_fks(schema)
+            # O índice de PK é criado vazio já aqui para que tabelas que referenciam esta
+            # possam guardar a referência a ele; _load_table o preenche
+            self.pk_index.setdefault(schema.name, {})
+            if schema_data.get('indexes'):
+                self.indexes[schema.name] = schema_data['indexes']
+            self._pending_tables.add(schema.name)
+
         print(f"INFO: Banco de dados '{self.db_path}' carregado com sucesso.")
 
+    def _load_table(self, table_name):
+        """
+        Lê do disco os dados de uma tabela pendente, monta sua BPlusTree de uma só vez
+        e retorna o _TableState dela.
+        As alterações registradas no log da tabela são reaplicadas sobre o snapshot.
+        Arquivos de dados no formato JSON antigo ('tablename.json') continuam sendo aceitos.
+        """
+        self._pending_tables.discard(table_name)
+        schema = self.tables[table_name]
+        data_path = os.path.join(self.db_path, f"{table_name}.pkl")
+        legacy_path = os.path.join(self.db_path, f"{table_name}.json")
+        if os.path.exists(data_path):
+            # O arquivo é mapeado em memória e o pickle lê dele quadro a quadro, sem copiar
+            # o arquivo inteiro para um buffer de leitura
+            with open(data_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # Formato colunar (ver _write_snapshot): os nomes das colunas e depois uma
+                # tupla por coluna; as linhas são remontadas com zip, na ordem atual do esquema
+                col_names = pickle.load(mm)
+                columns = {col_name: pickle.load(mm) for col_name in col_names}
+            keys = list(columns[schema.get_pk_name()])
+            rows = list(zip(*[columns[c] for c in schema.columns]))
+        elif os.path.exists(legacy_path):
+            # Formato antigo: lista de registros (dicionários) em JSON
+            with open(legacy_path, 'r') as f:
+                records = json.load(f)
+            pk_name = schema.get_pk_name()
+            col_names = tuple(schema.columns)
+            keys = [record[pk_name] for record in records]
+            rows = [tuple([record.get(c) for c in col_names]) for record in records]
+        else:
+            keys, rows = [], []
+
+        log_path = os.path.join(self.db_path, f"{table_name}.log")
+        if os.path.exists(log_path):
+            pk_pos = tuple(schema.columns).index(schema.get_pk_name())
+            table = dict(zip(keys, rows))
+            for tag, payload in self._read_log(log_path):
+                if tag == _LOG_INSERT:
+                    table[payload[pk_pos]] = payload
+                else:
+                    table.pop(payload, None)
+            keys, rows = list(table), list(table.values())
+
+        # Carrega a BPlusTree de uma só vez, sem uma inserção por linha
+        tree = BPlusTree(_TREE_ORDER)
+        tree.bulk_load(zip(keys, rows))
+        self.data[table_name] = tree
+        self.pk_index[table_name].update(zip(keys, rows))
+        self._cache_table(schema, tree)
+        return self._table_cache[table_name]
+
+    @staticmethod
+    def _read_log(log_path):
+        """
+        Lê as entradas (tipo, conteúdo) de um log. Uma entrada final incompleta (salvamento
+        interrompido) é descartada e cortada do arquivo, para que novos acréscimos fiquem alinhados.
+        """
+        header_size = _LOG_HEADER.size
+        unpack_from = _LOG_HEADER.unpack_from
+        entries = []
+        pos = end = os.path.getsize(log_path)
+        if end:
+            pos = 0
+            # As entradas são decodificadas de fatias de memoryview sobre o arquivo mapeado,
+            # sem copiar cada uma para um objeto bytes
+            with open(log_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as data:
+                    while pos + header_size <= end:
+                        tag, size = unpack_from(data, pos)
+                        if pos + header_size + size > end:
+                            break
+                        pos += header_size
+                        entries.append((tag, pickle.loads(data[pos:pos + size])))
+                        pos += size
+        if pos < end:
+            os.truncate(log_path, pos)
+        return entries
+
 
 # --- Aplicativo GUI usando Tkinter ---
+# O tkinter só é importado quando a interface gráfica é usada: a CLI (main.py) importa este
+# módulo sem carregar o Tcl/Tk, inclusive em ambientes sem display ou sem tkinter instalado.
+tk = messagebox = None
+
+def _load_tk():
+    global tk, messagebox
+    if tk is None:
+        import tkinter
+        from tkinter import messagebox as tk_messagebox
+        tk, messagebox = tkinter, tk_messagebox
+
+
 class DatabaseGUI:
     """
     Uma interface gráfica Tkinter simples para interagir com o DatabaseManager.
@@ -303,6 +921,7 @@ class DatabaseGUI:
     Exibe mensagens e dados da tabela atual em uma área de texto.
     """
     def __init__(self, master):
+        _load_tk()
         self.master = master
         master.title("Simulador de SGBD (com Salvar/Recarregar)")
         master.geometry("600x450") # Altura aumentada
@@ -369,11 +988,18 @@ class DatabaseGUI:
         Adiciona uma mensagem à área de texto de exibição.
         Garante que a área de texto possa ser rolada até o final.
         """
+        self.log_lines([message])
+
+    def log_lines(self, lines):
+        """
+        Adiciona várias mensagens à área de texto com uma única inserção no widget,
+        em vez de uma inserção (e rolagem) por linha.
+        """
         self.display_text.config(state=tk.NORMAL) # Habilita a edição temporariamente
-        self.display_text.insert(tk.END, message + "\n")
+        self.display_text.insert(tk.END, "\n".join(lines) + "\n")
         self.display_text.see(tk.END) # Rola até o final
         self.display_text.config(state=tk.DISABLED) # Desabilita a edição
-        self.status_label.config(text=message) # Atualiza a barra de status
+        self.status_label.config(text=lines[-1]) # Atualiza a barra de status
 
     def save_database(self):
         """
@@ -440,13 +1066,8 @@ class DatabaseGUI:
         """
         try:
             self.log_message("\n--- Tentando inserir novos dados ---")
-            current_users = self.db_manager.select("usuarios")
-            # Determina o próximo ID disponível
-            next_id = 1
-            if current_users:
-                # Obtém o ID máximo dos usuários atuais para garantir a exclusividade
-                max_id = max([u['id'] for u in current_users if 'id' in u])
-                next_id = max_id + 1
+            # Determina o próximo ID disponível sem percorrer a tabela
+            next_id = self.db_manager.next_pk("usuarios")
 
             new_user = {
                 "id": next_id,
@@ -471,29 +1092,31 @@ class DatabaseGUI:
         self.display_text.delete(1.0, tk.END) # Limpa o texto existente
         self.display_text.config(state=tk.DISABLED)
 
-        self.log_message("\n--- Conteúdo Atual do Banco de Dados ---")
+        # As linhas são acumuladas e enviadas ao widget de uma só vez
+        lines = ["\n--- Conteúdo Atual do Banco de Dados ---"]
         if not self.db_manager.tables:
-            self.log_message("Nenhuma tabela no banco de dados.")
+            lines.append("Nenhuma tabela no banco de dados.")
+            self.log_lines(lines)
             return
 
         for table_name in self.db_manager.tables:
-            self.log_message(f"\n>>>> Tabela: '{table_name}' <<<<")
+            lines.append(f"\n>>>> Tabela: '{table_name}' <<<<")
             try:
                 records = self.db_manager.select(table_name)
                 if records:
-                    for record in records:
-                        self.log_message(f"  Registro: {record}")
+                    lines.extend([f"  Registro: {record}" for record in records])
                 else:
-                    self.log_message("  Nenhum registro nesta tabela.")
+                    lines.append("  Nenhum registro nesta tabela.")
             except Exception as e:
-                self.log_message(f"  Erro ao buscar dados da tabela '{table_name}': {e}")
-        self.log_message("\n--- Fim do Conteúdo do Banco de Dados ---\n")
+                lines.append(f"  Erro ao buscar dados da tabela '{table_name}': {e}")
+        lines.append("\n--- Fim do Conteúdo do Banco de Dados ---\n")
+        self.log_lines(lines)
 
 
 if __name__ == "__main__":
     # Garante que o diretório 'my_db' exista antes de iniciar o aplicativo,
     # pois o DatabaseManager espera por ele. Se não existir, o DatabaseManager o cria.
-    
+    _load_tk()
     root = tk.Tk()
     app = DatabaseGUI(root)
     root.mainloop()
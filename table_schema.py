@@ -1,16 +1,39 @@
+import sys
+
+
 class Column:
-    def __init__(self, name, data_type, nullable=True):
-        self.name = name
+    __slots__ = ('name', 'data_type', 'nullable', 'primary_key')
+
+    def __init__(self, name, data_type, nullable=True, primary_key=False):
+        # Nomes internados: as buscas por coluna em dicionários comparam por identidade
+        self.name = sys.intern(name)
         self.data_type = data_type
         self.nullable = nullable
+        self.primary_key = primary_key
+
+    def to_dict(self):
+        return {'name': self.name, 'data_type': self.data_type,
+                'primary_key': self.primary_key, 'nullable': self.nullable}
 
 
 class TableSchema:
-    def __init__(self, name, columns, pk_name, foreign_keys=None):
-        self.name = name
+    # fk_tuples: pares (coluna FK, tabela referenciada) calculados uma vez na construção
+    __slots__ = ('name', 'columns', 'pk_name', 'foreign_keys', 'fk_tuples')
+
+    def __init__(self, name, columns, pk_name=None, foreign_keys=None):
+        self.name = sys.intern(name)
         self.columns = {c.name: c for c in columns}
-        self.pk_name = pk_name
+        # Sem pk_name, usa a coluna marcada como primary_key
+        pk_name = pk_name or next((c.name for c in columns if c.primary_key), None)
+        self.pk_name = sys.intern(pk_name) if pk_name else pk_name
         self.foreign_keys = foreign_keys or []
+        self.fk_tuples = tuple((sys.intern(fk['fk_col']), sys.intern(fk['ref_table'])) for fk in self.foreign_keys)
 
     def get_pk_name(self):
+        if not self.pk_name:
+            raise ValueError(f"Tabela '{self.name}' não tem chave primária definida.")
         return self.pk_name
+
+    def to_dict(self):
+        return {'name': self.name, 'columns': [c.to_dict() for c in self.columns.values()],
+                'pk_name': self.pk_name, 'foreign_keys': self.foreign_keys}
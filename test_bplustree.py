@@ -0,0 +1,238 @@
+import random
+import unittest
+
+from bplustree import BPlusTree
+
+
+def _check_structure(test, tree):
+    """
+    Verifica os invariantes da árvore: chaves ordenadas e dentro do intervalo dos
+    separadores dos pais, nenhum nó cheio após uma operação, todas as folhas na mesma
+    profundidade e a lista encadeada de folhas percorrendo as chaves em ordem.
+    Retorna a altura da árvore.
+    """
+    depths = set()
+
+    def walk(node, low, high, depth):
+        test.assertEqual(node.keys, sorted(node.keys))
+        test.assertLess(len(node.keys), tree.order)
+        for key in node.keys:
+            test.assertTrue(low is None or low <= key)
+            test.assertTrue(high is None or key < high)
+        if node.is_leaf:
+            test.assertEqual(len(node.keys), len(node.children_or_values))
+            depths.add(depth)
+            return
+        test.assertEqual(len(node.children_or_values), len(node.keys) + 1)
+        bounds = [low] + list(node.keys) + [high]
+        for i, child in enumerate(node.children_or_values):
+            walk(child, bounds[i], bounds[i + 1], depth + 1)
+
+    walk(tree.root, None, None, 1)
+    test.assertEqual(len(depths), 1)
+
+    node = tree.root
+    while not node.is_leaf:
+        node = node.children_or_values[0]
+    leaf_keys = []
+    while node:
+        leaf_keys.extend(node.keys)
+        node = node.next_leaf
+    test.assertEqual(leaf_keys, sorted(set(leaf_keys)))
+    return depths.pop()
+
+
+class BPlusTreeTestCase(unittest.TestCase):
+    def assert_matches(self, tree, expected):
+        """Confere estrutura, get_all em ordem de chave e search de cada chave."""
+        height = _check_structure(self, tree)
+        self.assertEqual(tree.get_all(), [expected[k] for k in sorted(expected)])
+        for key, value in expected.items():
+            self.assertEqual(tree.search(key), value)
+        return height
+
+
+class InsertSplitTest(BPlusTreeTestCase):
+    def test_internal_nodes_split_and_tree_grows(self):
+        tree = BPlusTree(3)
+        expected = {}
+        for key in range(200):
+            tree.insert(key, str(key))
+            expected[key] = str(key)
+        # Com ordem 3, 200 chaves só cabem com vários níveis de nós internos divididos
+        self.assertGreaterEqual(self.assert_matches(tree, expected), 5)
+
+    def test_random_inserts_match_dict(self):
+        rng = random.Random(1234)
+        for order in (3, 4, 5, 8, 32):
+            tree = BPlusTree(order)
+            expected = {}
+            for _ in range(1500):
+                key, value = rng.randrange(1000), rng.random()
+                tree.insert(key, value)
+                expected[key] = value
+            self.assert_matches(tree, expected)
+
+    def test_duplicate_key_replaces_value(self):
+        tree = BPlusTree(4)
+        for key in range(20):
+            tree.insert(key, "a")
+        tree.insert(7, "b")
+        expected = {key: "a" for key in range(20)}
+        expected[7] = "b"
+        self.assert_matches(tree, expected)
+
+    def test_search_missing_key(self):
+        tree = BPlusTree(4)
+        self.assertIsNone(tree.search(1))
+        for key in range(0, 40, 2):
+            tree.insert(key, key)
+        self.assertIsNone(tree.search(5))
+        self.assertIsNone(tree.search(100))
+
+    def test_order_below_three_is_rejected(self):
+        with self.assertRaises(ValueError):
+            BPlusTree(2)
+
+
+class BulkLoadTest(BPlusTreeTestCase):
+    def test_bulk_load_builds_valid_tree(self):
+        for order in (3, 4, 5, 8, 128):
+            for size in (0, 1, order - 1, order, order + 1, order * order + 1, 1000):
+                tree = BPlusTree(order)
+                tree.bulk_load((key, -key) for key in range(size))
+                self.assert_matches(tree, {key: -key for key in range(size)})
+
+    def test_bulk_load_sorts_input_and_keeps_last_duplicate(self):
+        tree = BPlusTree(4)
+        pairs = [(key, "a") for key in range(50)]
+        random.Random(7).shuffle(pairs)
+        tree.bulk_load(pairs + [(10, "b")])
+        expected = {key: "a" for key in range(50)}
+        expected[10] = "b"
+        self.assert_matches(tree, expected)
+
+    def test_bulk_load_replaces_contents(self):
+        tree = BPlusTree(4)
+        for key in range(30):
+            tree.insert(key, key)
+        tree.bulk_load((key, key) for key in range(100, 110))
+        self.assertIsNone(tree.search(5))
+        self.assert_matches(tree, {key: key for key in range(100, 110)})
+
+    def test_inserts_after_bulk_load(self):
+        tree = BPlusTree(4)
+        tree.bulk_load((key, key) for key in range(0, 200, 2))
+        expected = {key: key for key in range(0, 200, 2)}
+        for key in list(range(1, 200, 2)) + [500, -5]:
+            tree.insert(key, key)
+            expected[key] = key
+        self.assert_matches(tree, expected)
+
+
+class RangeScanTest(BPlusTreeTestCase):
+    def test_range_scan_matches_filtered_keys(self):
+        tree = BPlusTree(4)
+        keys = list(range(0, 300, 3))
+        for key in keys:
+            tree.insert(key, key)
+        bounds = [None, -5, 0, 1, 3, 44, 45, 150, 297, 298, 400]
+        for start in bounds:
+            for end in bounds:
+                for incl_start in (True, False):
+                    for incl_end in (True, False):
+                        expected = [k for k in keys
+                                    if (start is None or (k >= start if incl_start else k > start))
+                                    and (end is None or (k <= end if incl_end else k < end))]
+                        result = list(tree.range_scan(start, end, incl_start, incl_end))
+                        self.assertEqual(result, expected, (start, end, incl_start, incl_end))
+
+    def test_range_scan_on_empty_tree(self):
+        self.assertEqual(list(BPlusTree(4).range_scan(1, 10)), [])
+
+
+class DeleteTest(BPlusTreeTestCase):
+    def test_delete_reports_whether_key_existed(self):
+        tree = BPlusTree(4)
+        for key in range(10):
+            tree.insert(key, key)
+        self.assertTrue(tree.delete(3))
+        self.assertFalse(tree.delete(3))
+        self.assertFalse(tree.delete(42))
+        self.assert_matches(tree, {key: key for key in range(10) if key != 3})
+
+    def test_emptied_leaves_keep_lookups_and_scans_working(self):
+        tree = BPlusTree(4)
+        expected = {key: key for key in range(100)}
+        for key in expected:
+            tree.insert(key, key)
+        # Esvazia folhas inteiras no meio e nas pontas da árvore
+        for key in list(range(0, 10)) + list(range(40, 70)) + list(range(95, 100)):
+            self.assertTrue(tree.delete(key))
+            del expected[key]
+        self.assert_matches(tree, expected)
+        self.assertEqual(list(tree.range_scan(35, 75)), [k for k in sorted(expected) if 35 <= k <= 75])
+        self.assertEqual(list(tree.range_scan()), sorted(expected))
+        # Reinserções caem nas folhas vazias
+        for key in (45, 0, 99, 60):
+            tree.insert(key, key)
+            expected[key] = key
+        self.assert_matches(tree, expected)
+
+    def test_delete_everything(self):
+        tree = BPlusTree(3)
+        for key in range(50):
+            tree.insert(key, key)
+        for key in range(50):
+            tree.delete(key)
+        self.assert_matches(tree, {})
+        self.assertEqual(list(tree.range_scan()), [])
+
+
+class ClusteredInsertTest(BPlusTreeTestCase):
+    # Inserções próximas da anterior reaproveitam a última folha; os padrões abaixo
+    # alternam entre chaves dentro e fora dela para exercitar os dois caminhos.
+    def check_sequence(self, keys, order=4, tree=None, expected=None):
+        tree = tree or BPlusTree(order)
+        expected = {} if expected is None else expected
+        for key in keys:
+            tree.insert(key, key * 2)
+            expected[key] = key * 2
+        self.assert_matches(tree, expected)
+        return tree, expected
+
+    def test_ascending_and_descending_runs(self):
+        for order in (3, 4, 7):
+            self.check_sequence(range(300), order)
+            self.check_sequence(range(300, 0, -1), order)
+
+    def test_interleaved_and_clustered_keys(self):
+        self.check_sequence([k for i in range(100) for k in (i, 1000 - i)])
+        rng = random.Random(7)
+        keys, key = [], 0
+        for _ in range(2000):
+            key += rng.choice((-3, -1, 1, 1, 2, 50))
+            keys.append(key)
+        for order in (3, 5, 16):
+            self.check_sequence(keys, order)
+
+    def test_duplicates_replace_value(self):
+        tree, expected = self.check_sequence(range(100))
+        for key in (50, 50, 51, 0, 99):
+            tree.insert(key, "novo")
+            expected[key] = "novo"
+        self.assert_matches(tree, expected)
+
+    def test_inserts_after_bulk_load_and_delete(self):
+        tree = BPlusTree(4)
+        tree.bulk_load([(k, k * 2) for k in range(0, 400, 4)])
+        tree, expected = self.check_sequence(range(1, 400, 4), tree=tree,
+                                             expected={k: k * 2 for k in range(0, 400, 4)})
+        for key in range(0, 200):
+            if tree.delete(key):
+                del expected[key]
+        self.check_sequence(range(150, 250, 3), tree=tree, expected=expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
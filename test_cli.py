@@ -0,0 +1,47 @@
+import contextlib
+import io
+import shlex
+import tempfile
+import unittest
+
+from cli import DatabaseCLI, _split_command
+
+
+class SplitCommandTest(unittest.TestCase):
+    def test_matches_shlex(self):
+        # Linhas sem barras invertidas, onde o shlex usado antes e o regex devem concordar
+        for line in ["SELECT * FROM dept",
+                     "  INSERT   INTO dept VALUES (1, 'TI Geral')  ",
+                     "INSERT INTO dept VALUES (2, \"Sala 'B'\")",
+                     "UPDATE dept SET nome='TI Geral' WHERE id=1",
+                     "x=\"a b\"'c d'e",
+                     "'' \"\" a''b",
+                     "",
+                     "\t"]:
+            with self.subTest(line=line):
+                parts, upper = _split_command(line)
+                self.assertEqual(list(parts), shlex.split(line))
+                self.assertEqual(upper, tuple(p.upper() for p in parts))
+
+    def test_unclosed_quote(self):
+        for line in ["INSERT INTO dept VALUES (1, 'TI)", 'nome="TI', "a 'b' \"c"]:
+            with self.subTest(line=line):
+                with self.assertRaisesRegex(ValueError, "No closing quotation"):
+                    _split_command(line)
+
+
+class GuessValueTest(unittest.TestCase):
+    def test_untyped_values(self):
+        with tempfile.TemporaryDirectory() as path, contextlib.redirect_stdout(io.StringIO()):
+            cli = DatabaseCLI(path)
+        for text, value in [("TRUE", True), ("false", False), ("null", "null"), ("'null'", "null"),
+                            ("42", 42), ("-7", -7), ("1.5", 1.5), ("-.5", -0.5),
+                            ("1.2.3", "1.2.3"), ("'abc'", "abc"), ("\"x y\"", "x y")]:
+            with self.subTest(text=text):
+                guessed = cli._guess_value(text)
+                self.assertEqual(guessed, value)
+                self.assertIs(type(guessed), type(value))
+
+
+if __name__ == "__main__":
+    unittest.main()
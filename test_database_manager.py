@@ -0,0 +1,493 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from bplustree import BPlusTree
+from database_manager import Column, DatabaseManager, In, Range, TableSchema
+
+
+def _dept_schema():
+    return TableSchema("dept", [Column("id", "int", primary_key=True),
+                                Column("nome", "string")], pk_name="id")
+
+
+def _emp_schema():
+    return TableSchema("emp", [Column("id", "int", primary_key=True),
+                               Column("nome", "string"),
+                               Column("dept", "int")], pk_name="id",
+                       foreign_keys=[{'fk_col': 'dept', 'ref_table': 'dept', 'ref_col': 'id'}])
+
+
+class DatabaseTestCase(unittest.TestCase):
+    """Cada teste usa um diretório de banco próprio; as mensagens INFO são descartadas."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = self._tmp.name
+        self.db = self.open()
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def open(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return DatabaseManager(self.path)
+
+    def save(self, db=None):
+        with contextlib.redirect_stdout(io.StringIO()):
+            (db or self.db).save_to_disk()
+
+    def reopen(self):
+        self.save()
+        self.db = self.open()
+        return self.db
+
+    def create_dept_emp(self):
+        self.db.create_table(_dept_schema())
+        self.db.create_table(_emp_schema())
+        self.db.insert("dept", {"id": 1, "nome": "Vendas"})
+        self.db.insert("dept", {"id": 2, "nome": "TI"})
+        self.db.insert("emp", {"id": 10, "nome": "Ana", "dept": 1})
+        self.db.insert("emp", {"id": 11, "nome": "Bob", "dept": None})
+
+
+class LazyLoadTest(DatabaseTestCase):
+    def test_rows_survive_reload(self):
+        self.create_dept_emp()
+        db = self.reopen()
+        self.assertEqual(set(db.tables), {"dept", "emp"})
+        self.assertEqual(db.select("emp", {"id": 10}), [{"id": 10, "nome": "Ana", "dept": 1}])
+        self.assertEqual([r["id"] for r in db.select("dept")], [1, 2])
+
+    def test_untouched_table_is_not_read(self):
+        self.create_dept_emp()
+        self.reopen()
+        # Apagar os dados de uma tabela não acessada não afeta o uso das demais
+        for name in os.listdir(self.path):
+            if name.startswith("emp."):
+                os.remove(os.path.join(self.path, name))
+        self.assertEqual(len(self.db.select("dept")), 2)
+
+    def test_fk_checks_load_related_tables(self):
+        self.create_dept_emp()
+        db = self.reopen()
+        # A tabela referenciada é carregada para validar a FK do insert
+        db.insert("emp", {"id": 12, "nome": "Cid", "dept": 2})
+        with self.assertRaises(ValueError):
+            db.insert("emp", {"id": 13, "nome": "Dan", "dept": 99})
+        db = self.reopen()
+        # A tabela que referencia é carregada para proteger o registro referenciado
+        with self.assertRaises(ValueError):
+            db.delete("dept", 1)
+        db.insert("dept", {"id": 3, "nome": "RH"})
+        db.delete("dept", 3)
+        self.assertEqual([r["id"] for r in db.select("dept")], [1, 2])
+
+    def test_data_subscript_loads_pending_table(self):
+        self.create_dept_emp()
+        db = self.reopen()
+        tree = db.data["emp"]
+        self.assertIsInstance(tree, BPlusTree)
+        self.assertEqual(len(tree.get_all()), 2)
+        self.assertIs(db.data["emp"], tree)
+        with self.assertRaises(KeyError):
+            db.data["nao_existe"]
+
+    def test_data_get_and_membership_see_pending_tables(self):
+        self.create_dept_emp()
+        db = self.reopen()
+        self.assertIn("emp", db.data)
+        self.assertNotIn("nao_existe", db.data)
+        self.assertEqual(len(db.data), 0) # Nada foi carregado só pelo teste de pertinência
+        tree = db.data.get("emp")
+        self.assertIsInstance(tree, BPlusTree)
+        self.assertIs(db.data["emp"], tree)
+        self.assertIsNone(db.data.get("nao_existe"))
+        self.assertEqual(db.data.get("nao_existe", 0), 0)
+        self.assertEqual(list(db.data), ["emp"])
+
+
+class ForeignKeyTest(DatabaseTestCase):
+    def test_referencing_table_created_first(self):
+        self.db.create_table(_emp_schema())
+        self.db.create_table(_dept_schema())
+        self.db.insert("dept", {"id": 1, "nome": "Vendas"})
+        self.db.insert("emp", {"id": 10, "nome": "Ana", "dept": 1})
+        self.db.insert_many("emp", [{"id": 11, "nome": "Bob", "dept": 1}])
+        with self.assertRaisesRegex(ValueError, "FK '2' não existe"):
+            self.db.insert("emp", {"id": 12, "nome": "Cid", "dept": 2})
+        db = self.reopen()
+        db.insert("dept", {"id": 2, "nome": "TI"})
+        db.insert("emp", {"id": 12, "nome": "Cid", "dept": 2})
+        with self.assertRaises(ValueError):
+            db.delete("dept", 1)
+
+    def test_failed_create_leaves_nothing_behind(self):
+        broken = TableSchema("emp", [Column("id", "int", primary_key=True)], pk_name="id",
+                             foreign_keys=[{'fk_col': 'dept', 'ref_table': 'dept', 'ref_col': 'id'}])
+        with self.assertRaises((KeyError, ValueError)):
+            self.db.create_table(broken)
+        self.assertNotIn("emp", self.db.tables)
+        self.create_dept_emp()
+        db = self.reopen()
+        self.assertEqual(sorted(db.tables), ["dept", "emp"])
+        db.delete("dept", 2)
+
+
+class PredicateTest(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.db.create_table(TableSchema("t", [Column("id", "int", primary_key=True),
+                                               Column("grupo", "string"),
+                                               Column("valor", "int")], pk_name="id"))
+        self.rows = [{"id": i, "grupo": "abc"[i % 3], "valor": i * 10 % 70} for i in range(1, 61)]
+        for row in self.rows:
+            self.db.insert("t", row)
+
+    def assert_selects(self, where, predicate):
+        result = self.db.select("t", where)
+        self.assertEqual(sorted(result, key=lambda r: r["id"]), [r for r in self.rows if predicate(r)])
+
+    def test_pk_range_is_ordered_and_respects_bounds(self):
+        result = self.db.select("t", {"id": Range(10, 20, incl_start=False)})
+        self.assertEqual([r["id"] for r in result], list(range(11, 21)))
+        self.assert_selects({"id": Range(None, 5)}, lambda r: r["id"] <= 5)
+        self.assert_selects({"id": Range(55, None, incl_start=False)}, lambda r: r["id"] > 55)
+        self.assert_selects({"id": Range(100, 200)}, lambda r: False)
+
+    def test_pk_in_and_equality(self):
+        self.assert_selects({"id": In([5, 7, 7, 99])}, lambda r: r["id"] in (5, 7))
+        self.assert_selects({"id": 5}, lambda r: r["id"] == 5)
+        self.assert_selects({"id": 99}, lambda r: False)
+
+    def test_non_pk_predicates(self):
+        self.assert_selects({"valor": Range(20, 40, incl_end=False)}, lambda r: 20 <= r["valor"] < 40)
+        self.assert_selects({"grupo": In(["a", "c"])}, lambda r: r["grupo"] in ("a", "c"))
+        self.assert_selects({"grupo": "b", "valor": 30}, lambda r: r["grupo"] == "b" and r["valor"] == 30)
+
+    def test_pk_and_non_pk_combined(self):
+        self.assert_selects({"id": Range(10, 40), "grupo": "a"}, lambda r: 10 <= r["id"] <= 40 and r["grupo"] == "a")
+        self.assert_selects({"id": In([3, 4, 6]), "valor": In([30, 60])},
+                            lambda r: r["id"] in (3, 4, 6) and r["valor"] in (30, 60))
+
+    def test_unknown_column_in_where(self):
+        with self.assertRaises(ValueError):
+            self.db.select("t", {"nao_existe": 1})
+
+
+class ChangeLogTest(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.db.create_table(_dept_schema())
+        for i in range(200):
+            self.db.insert("dept", {"id": i, "nome": f"Departamento {i}"})
+        self.save()
+        self.log_path = os.path.join(self.path, "dept.log")
+        self.data_path = os.path.join(self.path, "dept.pkl")
+
+    def ids(self, db):
+        return sorted(r["id"] for r in db.select("dept"))
+
+    @staticmethod
+    def read_bytes(path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    def test_small_changes_are_appended_to_the_log(self):
+        snapshot = self.read_bytes(self.data_path)
+        self.db.insert("dept", {"id": 500, "nome": "Novo"})
+        self.db.delete("dept", 3)
+        self.save()
+        self.assertTrue(os.path.exists(self.log_path))
+        self.assertEqual(self.read_bytes(self.data_path), snapshot)
+        self.db.delete("dept", 500)
+        self.db.insert("dept", {"id": 3, "nome": "De volta"})
+        db = self.reopen()
+        self.assertEqual(self.ids(db), list(range(200)))
+        self.assertEqual(db.select("dept", {"id": 3})[0]["nome"], "De volta")
+
+    def test_large_log_is_compacted_into_a_snapshot(self):
+        for i in range(200, 1000):
+            self.db.insert("dept", {"id": i, "nome": f"Departamento {i}"})
+        self.save()
+        self.assertFalse(os.path.exists(self.log_path))
+        self.assertEqual(self.ids(self.open()), list(range(1000)))
+
+    def test_snapshot_round_trip(self):
+        self.db.create_table(_emp_schema())
+        self.db.insert_many("emp", [{"id": i, "nome": "Nome %d" % (i % 3), "dept": i % 7 or None}
+                                    for i in range(300)])
+        expected = sorted(self.db.select("emp"), key=lambda r: r["id"])
+        db = self.reopen()
+        rows = sorted(db.select("emp"), key=lambda r: r["id"])
+        self.assertEqual(rows, expected)
+        # Valores repetidos de colunas string voltam como o mesmo objeto
+        self.assertIs(rows[0]["nome"], rows[3]["nome"])
+        self.assertEqual(self.ids(db), list(range(200)))
+
+    def test_metadata_is_rewritten_only_after_schema_changes(self):
+        metadata_path = os.path.join(self.path, "metadata.json")
+        inode = os.stat(metadata_path).st_ino
+        self.db.insert("dept", {"id": 500, "nome": "Novo"})
+        self.save()
+        self.assertEqual(os.stat(metadata_path).st_ino, inode)
+        self.db.create_table(_emp_schema())
+        self.save()
+        inode = os.stat(metadata_path).st_ino
+        self.db.insert("emp", {"id": 1, "nome": "Ana", "dept": 500})
+        self.save()
+        self.assertEqual(os.stat(metadata_path).st_ino, inode)
+        self.assertEqual(self.open().select("emp")[0]["dept"], 500)
+
+    def test_torn_log_tail_is_discarded(self):
+        self.db.insert("dept", {"id": 500, "nome": "Novo"})
+        self.save()
+        # Entrada final incompleta: cabeçalho anunciando 1000 bytes seguido de só 2
+        with open(self.log_path, "ab") as f:
+            f.write(b"\x01\xe8\x03\x00\x00xx")
+        db = self.open()
+        self.assertEqual(self.ids(db), list(range(200)) + [500])
+        # Acréscimos depois do corte continuam legíveis
+        db.insert("dept", {"id": 501, "nome": "Outro"})
+        self.save(db)
+        self.assertEqual(self.ids(self.open()), list(range(200)) + [500, 501])
+
+
+class InsertManyTest(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.db.create_table(_dept_schema())
+        self.db.create_table(_emp_schema())
+
+    def emp(self, i, dept=None):
+        return {"id": i, "nome": f"E{i}", "dept": dept}
+
+    def test_batches_into_empty_and_filled_tables(self):
+        self.assertEqual(self.db.insert_many("dept", [{"id": i, "nome": str(i)} for i in range(0, 100, 2)]), 50)
+        self.assertEqual(self.db.insert_many("dept", [{"id": i, "nome": str(i)} for i in (1, 3)]), 2)
+        # Lote maior que a tabela, com PKs intercaladas às existentes
+        self.db.insert_many("dept", [{"id": i, "nome": str(i)} for i in range(5, 300, 2)])
+        self.assertEqual(self.db.insert_many("dept", []), 0)
+        expected = sorted(set(range(0, 100, 2)) | {1, 3} | set(range(5, 300, 2)))
+        self.assertEqual(sorted(r["id"] for r in self.db.select("dept")), expected)
+        self.assertEqual(sorted(r["id"] for r in self.reopen().select("dept")), expected)
+
+    def test_failed_batch_inserts_nothing(self):
+        self.db.insert_many("dept", [{"id": 1, "nome": "a"}])
+        bad_batches = [
+            [self.emp(1), self.emp(2), self.emp(1)],             # PK repetida no lote
+            [self.emp(3, 1), self.emp(4, 7)],                    # FK inexistente
+            [self.emp(5), {"id": 6, "nome": 6, "dept": None}],   # tipo inválido
+            [self.emp(8), {"id": 9, "outra": 1}],                # coluna inexistente
+        ]
+        for batch in bad_batches:
+            with self.assertRaises((ValueError, TypeError)):
+                self.db.insert_many("emp", batch)
+            self.assertEqual(self.db.select("emp"), [])
+        self.db.insert_many("emp", [self.emp(1, 1)])
+        with self.assertRaises(ValueError):
+            self.db.insert_many("emp", [self.emp(2), self.emp(1)]) # PK já existente
+        self.assertEqual([r["id"] for r in self.db.select("emp")], [1])
+
+    def test_batch_references_are_counted(self):
+        self.db.insert_many("dept", [{"id": 1, "nome": "a"}, {"id": 2, "nome": "b"}])
+        self.db.insert_many("emp", [self.emp(1, 1), self.emp(2, 1)])
+        with self.assertRaises(ValueError):
+            self.db.delete("dept", 1)
+        self.db.delete("emp", 1)
+        with self.assertRaises(ValueError):
+            self.db.delete("dept", 1)
+        self.db.delete("emp", 2)
+        self.db.delete("dept", 1)
+        self.assertEqual([r["id"] for r in self.db.select("dept")], [2])
+
+    def test_self_reference_within_batch(self):
+        self.db.create_table(TableSchema("no", [Column("id", "int", primary_key=True),
+                                                Column("pai", "int")], pk_name="id",
+                                         foreign_keys=[{'fk_col': 'pai', 'ref_table': 'no', 'ref_col': 'id'}]))
+        self.db.insert_many("no", [{"id": 2, "pai": 1}, {"id": 1, "pai": None}])
+        with self.assertRaises(ValueError):
+            self.db.insert_many("no", [{"id": 3, "pai": 4}])
+        self.assertEqual([r["id"] for r in self.db.select("no")], [1, 2])
+
+
+class GroupTableTestCase(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.db.create_table(TableSchema("t", [Column("id", "int", primary_key=True),
+                                               Column("grupo", "string"),
+                                               Column("valor", "int")], pk_name="id"))
+        for i in range(1, 31):
+            self.db.insert("t", {"id": i, "grupo": "abc"[i % 3], "valor": i % 4 or None})
+
+    def ids(self, where, db=None):
+        return sorted(r["id"] for r in (db or self.db).select("t", where))
+
+    def expected(self, predicate):
+        return [r["id"] for r in sorted(self.db.select("t"), key=lambda r: r["id"]) if predicate(r)]
+
+
+class SecondaryIndexTest(GroupTableTestCase):
+
+    def test_indexed_queries_follow_writes(self):
+        self.db.create_index("t", "grupo")
+        self.db.create_index("t", "valor")
+        self.db.insert("t", {"id": 31, "grupo": "a", "valor": 2})
+        self.db.insert_many("t", [{"id": 32, "grupo": "z", "valor": None},
+                                  {"id": 33, "grupo": "a", "valor": 3}])
+        self.db.delete("t", 3)
+        self.db.delete("t", 32)
+        for where, predicate in [
+                ({"grupo": "a"}, lambda r: r["grupo"] == "a"),
+                ({"grupo": "z"}, lambda r: False),
+                ({"valor": None}, lambda r: r["valor"] is None),
+                ({"grupo": In(["a", "b"])}, lambda r: r["grupo"] in ("a", "b")),
+                ({"grupo": "a", "valor": 2}, lambda r: r["grupo"] == "a" and r["valor"] == 2),
+                ({"grupo": "b", "valor": Range(2, 3)}, lambda r: r["grupo"] == "b" and r["valor"] in (2, 3))]:
+            self.assertEqual(self.ids(where), self.expected(predicate), where)
+
+    def test_indexes_are_persisted(self):
+        self.db.create_index("t", "grupo")
+        expected = self.ids({"grupo": "b"})
+        db = self.reopen()
+        db.insert("t", {"id": 100, "grupo": "b", "valor": 1})
+        self.assertEqual(self.ids({"grupo": "b"}, db), expected + [100])
+        self.assertEqual(self.ids({"grupo": "b"}, self.reopen()), expected + [100])
+
+    def test_unhashable_indexed_value_leaves_table_unchanged(self):
+        self.db.create_table(TableSchema("u", [Column("id", "int", primary_key=True),
+                                               Column("dados", "text")], pk_name="id"))
+        self.db.create_index("u", "dados")
+        self.db.insert("u", {"id": 1, "dados": "a"})
+        with self.assertRaisesRegex(TypeError, "'dados'"):
+            self.db.insert("u", {"id": 2, "dados": ["a"]})
+        for batch in ([{"id": 2, "dados": "b"}, {"id": 3, "dados": {}}],
+                      [{"id": 2, "dados": []}] + [{"id": i, "dados": "c"} for i in range(3, 10)]):
+            with self.assertRaises(TypeError):
+                self.db.insert_many("u", batch)
+        self.assertEqual(self.db.select("u"), [{"id": 1, "dados": "a"}])
+        self.db.insert("u", {"id": 2, "dados": "a"})
+        self.assertEqual(sorted(r["id"] for r in self.db.select("u", {"dados": "a"})), [1, 2])
+        self.assertEqual(sorted(r["id"] for r in self.reopen().select("u")), [1, 2])
+
+    def test_invalid_index_columns(self):
+        with self.assertRaises(ValueError):
+            self.db.create_index("t", "nao_existe")
+        with self.assertRaises(ValueError):
+            self.db.create_index("t", "id")
+
+
+class QueryPlanTest(GroupTableTestCase):
+    # Consultas repetidas reaproveitam o plano compilado; os resultados devem
+    # acompanhar as escritas e os índices criados depois da primeira consulta.
+    def test_repeated_queries_follow_writes_and_new_indexes(self):
+        queries = [({"grupo": "a"}, lambda r: r["grupo"] == "a"),
+                   ({"grupo": "b", "valor": 1}, lambda r: r["grupo"] == "b" and r["valor"] == 1),
+                   ({"id": Range(5, 20), "grupo": "c"}, lambda r: 5 <= r["id"] <= 20 and r["grupo"] == "c")]
+        for step in range(4):
+            for where, predicate in queries:
+                self.assertEqual(self.ids(where), self.expected(predicate), (step, where))
+            if step == 0:
+                self.db.insert("t", {"id": 40, "grupo": "a", "valor": 1})
+            elif step == 1:
+                self.db.create_index("t", "grupo")
+            elif step == 2:
+                self.db.delete("t", 40)
+                self.db.insert_many("t", [{"id": 41, "grupo": "b", "valor": 1}])
+
+    def test_many_distinct_queries(self):
+        for i in range(600):
+            self.assertEqual(self.ids({"id": i % 40, "grupo": "abc"[i % 3]}),
+                             self.expected(lambda r: r["id"] == i % 40 and r["grupo"] == "abc"[i % 3]))
+
+    def test_repeated_results_follow_writes(self):
+        where = {"grupo": "a", "valor": Range(1, 3)}
+        predicate = lambda r: r["grupo"] == "a" and r["valor"] is not None and 1 <= r["valor"] <= 3
+        first = self.db.select_rows("t", where)
+        self.assertEqual(self.db.select_rows("t", where), first)
+        self.db.create_table(TableSchema("outra", [Column("id", "int", primary_key=True)], pk_name="id"))
+        self.db.insert("outra", {"id": 1})
+        self.assertEqual(self.db.select_rows("t", where), first)
+        writes = [lambda: self.db.insert("t", {"id": 50, "grupo": "a", "valor": 2}),
+                  lambda: self.db.insert_many("t", [{"id": 51, "grupo": "a", "valor": 3}]),
+                  lambda: self.db.delete("t", 50),
+                  lambda: self.db.create_index("t", "grupo"),
+                  lambda: self.db.delete("t", 51)]
+        for write in writes:
+            write()
+            self.assertEqual(self.ids(where), self.expected(predicate))
+            self.assertEqual(self.ids(where), self.expected(predicate))
+
+    def test_unhashable_values(self):
+        self.db.create_index("t", "grupo")
+        self.assertEqual(self.ids({"grupo": ["a"]}), [])
+
+
+class NextPkTest(DatabaseTestCase):
+    def test_next_pk_follows_inserts_and_deletes(self):
+        self.db.create_table(_dept_schema())
+        self.assertEqual(self.db.next_pk("dept"), 1)
+        self.db.insert("dept", {"id": 5, "nome": "A"})
+        self.assertEqual(self.db.next_pk("dept"), 6)
+        self.db.insert_many("dept", [{"id": 9, "nome": "B"}, {"id": 7, "nome": "C"}])
+        self.assertEqual(self.db.next_pk("dept"), 10)
+        self.db.delete("dept", 9)
+        self.assertEqual(self.db.next_pk("dept"), 10)
+        # O máximo não é gravado: após recarregar, vem das linhas existentes
+        self.assertEqual(self.reopen().next_pk("dept"), 8)
+
+    def test_non_int_pk_is_rejected(self):
+        self.db.create_table(TableSchema("s", [Column("cod", "string", primary_key=True)], pk_name="cod"))
+        self.db.insert("s", {"cod": "x"})
+        with self.assertRaisesRegex(ValueError, "'cod'.*não é do tipo int"):
+            self.db.next_pk("s")
+
+
+class ValidatorTest(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.db.create_table(TableSchema("v", [Column("id", "int", primary_key=True),
+                                               Column("nome", "string", nullable=False),
+                                               Column("nasc", "date"),
+                                               Column("ativo", "boolean"),
+                                               Column("nota", "float"),
+                                               Column("we'ird \"x\"", "int"),
+                                               Column("extra", "blob")], pk_name="id"))
+
+    def assert_rejected(self, record, error, message):
+        with self.assertRaises(error) as ctx:
+            self.db.insert("v", record)
+        self.assertIn(message, str(ctx.exception))
+        self.assertEqual(self.db.select("v"), [])
+
+    def test_valid_rows(self):
+        rows = [{"id": 1, "nome": "a", "nasc": "2024-01-05", "ativo": True, "nota": 1.5,
+                 "we'ird \"x\"": 3, "extra": [1, 2]},
+                {"id": 2, "nome": "b", "nasc": "2024-1-5", "ativo": None, "nota": 2,
+                 "we'ird \"x\"": None, "extra": None},
+                {"id": 3, "nome": "c", "ativo": False, "we'ird \"x\"": True}]
+        for row in rows:
+            self.db.insert("v", row)
+        self.assertEqual(self.db.select("v", {"id": 1}), [rows[0]])
+        self.assertEqual(self.db.select("v", {"id": 3})[0]["nasc"], None)
+
+    def test_invalid_rows(self):
+        for record, error, message in [
+                ({"id": 1, "nome": "a", "nasc": "2024-13-01"}, ValueError, "Formato de data inválido para 'nasc'"),
+                ({"id": 1, "nome": "a", "nasc": 20240101}, TypeError, "'nasc'"),
+                ({"id": 1, "nome": 5}, TypeError, "Esperado: string, recebido: int"),
+                ({"id": "1", "nome": "a"}, TypeError, "Esperado: int, recebido: str"),
+                ({"id": 1, "nome": "a", "ativo": 1}, TypeError, "'ativo'"),
+                ({"id": 1, "nome": "a", "nota": "1.5"}, TypeError, "'nota'"),
+                ({"id": 1, "nome": "a", "we'ird \"x\"": 1.0}, TypeError, "we'ird \"x\""),
+                ({"id": 1, "nome": "a", "outra": 1}, ValueError, "Coluna 'outra' não existe"),
+                ({"id": 1}, ValueError, "Coluna 'nome' não pode ser nula"),
+                ({"nome": "a"}, ValueError, "Chave primária 'id' não pode ser nula")]:
+            with self.subTest(record=record):
+                self.assert_rejected(record, error, message)
+
+
+if __name__ == "__main__":
+    unittest.main()